@@ -2,7 +2,6 @@ import secrets
 import typing as t
 
 from django.conf import settings
-from django.shortcuts import reverse
 
 from eggslist.users.determine_location import locate_request
 from eggslist.users.user_location_storage import UserLocationStorage
@@ -12,39 +11,53 @@ if t.TYPE_CHECKING:
 
 
 class LocationMiddleware:
+    """
+    Resolve visitor's location once per request and attach it as `request.location`.
+    Only views with `location_aware = True` attribute get it, others skip
+    the storage read and the GeoIP fallback.
+    """
+
     def __init__(self, get_response: t.Callable):
         self.get_response = get_response
 
     def __call__(self, request: "HttpRequest"):
-        if request.path.startswith(reverse("eggslist:stripe-webhook")):
-            return self.get_response(request)
+        response = self.get_response(request)
+        user_location_id = getattr(request, "new_user_location_id", None)
+        if user_location_id is not None:
+            response.set_cookie(
+                settings.USER_LOCATION_COOKIE_NAME,
+                user_location_id,
+                domain=settings.SESSION_COOKIE_DOMAIN,
+            )
+        return response
+
+    @staticmethod
+    def is_location_aware(view_func: t.Callable) -> bool:
+        view_class = getattr(view_func, "view_class", None)
+        return getattr(view_class or view_func, "location_aware", False)
+
+    def process_view(self, request: "HttpRequest", view_func: t.Callable, view_args, view_kwargs):
+        if not self.is_location_aware(view_func):
+            return None
 
         user_location_id = request.COOKIES.get(settings.USER_LOCATION_COOKIE_NAME, None)
 
         if user_location_id is None:
             user_location_id = secrets.token_hex(6)
 
-        location_city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(
-            user_id=user_location_id
-        )
+        location = UserLocationStorage.get_user_location(user_id=user_location_id)
 
-        if location_city is not None:
-            return self.get_response(request)
+        if location is not None:
+            request.location = location
+            return None
 
         location_city, is_undefined = locate_request(request)
-        lookup_radius = settings.DEFAULT_LOOKUP_RADIUS
-
-        UserLocationStorage.set_user_location(
+        request.location = UserLocationStorage.set_user_location(
             user_id=user_location_id,
             city_location=location_city,
-            lookup_radius=lookup_radius,
+            lookup_radius=settings.DEFAULT_LOOKUP_RADIUS,
             is_undefined=is_undefined,
         )
         request.COOKIES[settings.USER_LOCATION_COOKIE_NAME] = user_location_id
-        response = self.get_response(request)
-        response.set_cookie(
-            settings.USER_LOCATION_COOKIE_NAME,
-            user_location_id,
-            domain=settings.SESSION_COOKIE_DOMAIN,
-        )
-        return response
+        request.new_user_location_id = user_location_id
+        return None
@@ -48,6 +48,7 @@ INSTALLED_APPS = (
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.gis",
+    "django.contrib.postgres",
     "django.contrib.sites",
     "app.admin.EggslistAdminConfig",
     "django.contrib.humanize",
@@ -12,6 +12,10 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True
 SITE_URL = "https://127.0.0.1:8000"
 SESSION_COOKIE_DOMAIN = "127.0.0.1"
 EMAIL_BACKEND = "django.core.mail.backends.dummy.EmailBackend"
+# To see emails sent by `send_queued_emails` use a local SMTP stand-in instead:
+# `python -m smtpd -n -c DebuggingServer localhost:1025`
+# EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# EMAIL_HOST, EMAIL_PORT, EMAIL_USE_SSL = "localhost", 1025, False
 
 RUN_MODE = sys.argv[1] if len(sys.argv) > 1 else None
 
@@ -1,22 +1,55 @@
 import os
-from urllib.parse import urljoin
+import typing as t
+from urllib.parse import quote, urljoin
 
 from django.conf import settings
 from storages.backends.s3boto3 import S3Boto3Storage, S3StaticStorage
 
 
-class StaticStorage(S3StaticStorage):
+class PublicURLMixin:
+    """
+    Without query string authentication a URL of a file is the bucket URL
+    followed by the file name, yet S3Boto3Storage presigns every URL with boto3
+    and strips the signature afterwards. The bucket URL is computed once by
+    boto3 and names are appended to it, encoded the way boto3 encodes keys.
+    """
+
+    _URL_PREFIX_KEY = "url-prefix"
+    _url_prefix: t.Optional[str] = None
+
+    def get_url_prefix(self) -> str:
+        if self._url_prefix is None:
+            url = self.bucket.meta.client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": self.bucket.name, "Key": self._URL_PREFIX_KEY},
+                ExpiresIn=self.querystring_expire,
+            )
+            url = self._strip_signing_parameters(url)
+            if not url.endswith(self._URL_PREFIX_KEY):
+                raise ValueError(f"Unexpected S3 URL format: {url}")
+            self._url_prefix = url[: -len(self._URL_PREFIX_KEY)]
+        return self._url_prefix
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        if self.querystring_auth or self.custom_domain or parameters or http_method:
+            return super().url(name, parameters=parameters, expire=expire, http_method=http_method)
+
+        name = self._normalize_name(self._clean_name(name))
+        return self.get_url_prefix() + quote(name, safe="/~")
+
+
+class StaticStorage(PublicURLMixin, S3StaticStorage):
     location = "backend-static"
     default_acl = "public-read"
 
 
-class PublicMediaStorage(S3Boto3Storage):
+class PublicMediaStorage(PublicURLMixin, S3Boto3Storage):
     location = "media"
     default_acl = "public-read"
     file_overwrite = False
 
 
-class CKEditorStorage(S3Boto3Storage):
+class CKEditorStorage(PublicURLMixin, S3Boto3Storage):
     """Custom storage for django_ckeditor_5 images."""
 
     location = os.path.join(settings.MEDIA_ROOT, "ckeditor_5")
@@ -9,12 +9,14 @@ from eggslist.utils.views.mixins import CacheListAPIMixin
 
 class LocationStateListAPIView(CacheListAPIMixin, generics.ListAPIView):
     cache_key = "location_states"
+    cache_models = (models.LocationState, models.LocationCountry)
     serializer_class = serializers.StateLocationSerializer
     queryset = models.LocationState.objects.select_related("country").all()
 
 
 class LocationCityListAPIView(CacheListAPIMixin, generics.ListAPIView):
     cache_key = "location_cities"
+    cache_models = (models.LocationCity, models.LocationState, models.LocationCountry)
     serializer_class = serializers.CityLocationSerializer
     queryset = models.LocationCity.objects.all()
     filter_backends = (DjangoFilterBackend, SearchFilter)
@@ -11,4 +11,6 @@ class SiteConfigurationAppsConfig(AppConfig):
     def ready(self):
         import stripe
 
+        import eggslist.site_configuration.signals.location_index  # noqa
+
         stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -0,0 +1,218 @@
+import math
+import threading
+import time
+import typing as t
+from array import array
+
+from eggslist.site_configuration.models import LocationCity, LocationZipCode
+from eggslist.utils.cache_generation import CacheGeneration
+
+LOCATIONS_CACHE_GENERATION = "locations"
+
+
+class CityRecord(t.NamedTuple):
+    id: int
+    name: str
+    slug: str
+    state_name: str
+    country_name: str
+    longitude: t.Optional[float]
+    latitude: t.Optional[float]
+
+
+class ZipCodeRecord(t.NamedTuple):
+    id: int
+    name: str
+    slug: str
+    city_id: int
+    longitude: t.Optional[float]
+    latitude: t.Optional[float]
+
+
+def _normalize(name: str) -> str:
+    return name.strip().casefold()
+
+
+class _CityTable:
+    """
+    Columns of all cities. Coordinates and foreign keys are kept in typed arrays,
+    strings in plain lists and row numbers in the lookup dictionaries
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.longitudes = array("d")
+        self.latitudes = array("d")
+        self.state_rows = array("l")
+        self.names: t.List[str] = []
+        self.slugs: t.List[str] = []
+        # (state name, country name) referenced by `state_rows`
+        self.states: t.List[t.Tuple[str, str]] = []
+        self.by_id: t.Dict[int, int] = {}
+        self.by_slug: t.Dict[str, int] = {}
+        self.by_name: t.Dict[t.Tuple[str, str], int] = {}
+
+    def record(self, row: int) -> CityRecord:
+        state_name, country_name = self.states[self.state_rows[row]]
+        longitude, latitude = self.longitudes[row], self.latitudes[row]
+        # NaN marks a missing location
+        has_location = not math.isnan(longitude)
+        return CityRecord(
+            id=self.ids[row],
+            name=self.names[row],
+            slug=self.slugs[row],
+            state_name=state_name,
+            country_name=country_name,
+            longitude=longitude if has_location else None,
+            latitude=latitude if has_location else None,
+        )
+
+
+class _ZipCodeTable:
+    def __init__(self):
+        self.ids = array("q")
+        self.city_ids = array("q")
+        self.longitudes = array("d")
+        self.latitudes = array("d")
+        self.names: t.List[str] = []
+        self.slugs: t.List[str] = []
+        self.by_id: t.Dict[int, int] = {}
+        self.by_slug: t.Dict[str, int] = {}
+
+    def record(self, row: int) -> ZipCodeRecord:
+        longitude, latitude = self.longitudes[row], self.latitudes[row]
+        has_location = not math.isnan(longitude)
+        return ZipCodeRecord(
+            id=self.ids[row],
+            name=self.names[row],
+            slug=self.slugs[row],
+            city_id=self.city_ids[row],
+            longitude=longitude if has_location else None,
+            latitude=latitude if has_location else None,
+        )
+
+
+def _coordinates(point) -> t.Tuple[float, float]:
+    if point is None:
+        return float("nan"), float("nan")
+    return point.x, point.y
+
+
+class LocationIndex:
+    """
+    Per-process lookup table of cities and zip codes. It is loaded lazily with
+    two queries and answers lookups by id, slug and case-folded name without
+    touching the database.
+
+    Location tables change only with migrations and admin edits, which bump the
+    `locations` cache generation. Every process compares its loaded generation
+    with the cached one at most once in `check_interval` seconds and reloads
+    the tables when they differ.
+    """
+
+    check_interval = 60
+
+    _lock = threading.Lock()
+    _tables: t.Optional[t.Tuple[_CityTable, _ZipCodeTable]] = None
+    _generation: t.Optional[int] = None
+    _checked_at: float = 0.0
+
+    @classmethod
+    def _load(cls) -> t.Tuple[_CityTable, _ZipCodeTable]:
+        cities = _CityTable()
+        state_rows: t.Dict[int, int] = {}
+        city_rows = (
+            LocationCity.objects.order_by("id")
+            .values_list(
+                "id", "name", "slug", "location", "state_id", "state__name", "state__country__name"
+            )
+            .iterator()
+        )
+        for row, city in enumerate(city_rows):
+            city_id, name, slug, location, state_id, state_name, country_name = city
+            if state_id not in state_rows:
+                state_rows[state_id] = len(cities.states)
+                cities.states.append((state_name, country_name))
+            longitude, latitude = _coordinates(location)
+            cities.ids.append(city_id)
+            cities.longitudes.append(longitude)
+            cities.latitudes.append(latitude)
+            cities.state_rows.append(state_rows[state_id])
+            cities.names.append(name)
+            cities.slugs.append(slug)
+            cities.by_id[city_id] = row
+            cities.by_slug[slug] = row
+            # The first city wins when the same name repeats within a state
+            cities.by_name.setdefault((_normalize(name), _normalize(state_name)), row)
+
+        zip_codes = _ZipCodeTable()
+        zip_code_rows = (
+            LocationZipCode.objects.order_by("id")
+            .values_list("id", "name", "slug", "city_id", "location")
+            .iterator()
+        )
+        for row, (zip_code_id, name, slug, city_id, location) in enumerate(zip_code_rows):
+            longitude, latitude = _coordinates(location)
+            zip_codes.ids.append(zip_code_id)
+            zip_codes.city_ids.append(city_id)
+            zip_codes.longitudes.append(longitude)
+            zip_codes.latitudes.append(latitude)
+            zip_codes.names.append(name)
+            zip_codes.slugs.append(slug)
+            zip_codes.by_id[zip_code_id] = row
+            zip_codes.by_slug[slug] = row
+
+        return cities, zip_codes
+
+    @classmethod
+    def _get_tables(cls) -> t.Tuple[_CityTable, _ZipCodeTable]:
+        now = time.monotonic()
+        if cls._tables is not None and now - cls._checked_at < cls.check_interval:
+            return cls._tables
+
+        with cls._lock:
+            if cls._tables is not None and now - cls._checked_at < cls.check_interval:
+                return cls._tables
+            generation = CacheGeneration.get(LOCATIONS_CACHE_GENERATION)
+            if cls._tables is None or generation != cls._generation:
+                cls._tables = cls._load()
+                cls._generation = generation
+            cls._checked_at = now
+            return cls._tables
+
+    @staticmethod
+    def invalidate():
+        CacheGeneration.bump(LOCATIONS_CACHE_GENERATION)
+
+    @classmethod
+    def get_city(cls, city_id: int) -> t.Optional[CityRecord]:
+        cities, _ = cls._get_tables()
+        row = cities.by_id.get(city_id)
+        return cities.record(row) if row is not None else None
+
+    @classmethod
+    def get_city_by_slug(cls, slug: str) -> t.Optional[CityRecord]:
+        cities, _ = cls._get_tables()
+        row = cities.by_slug.get(slug)
+        return cities.record(row) if row is not None else None
+
+    @classmethod
+    def get_city_by_name(cls, name: str, state_name: str) -> t.Optional[CityRecord]:
+        """
+        Case insensitive lookup by city and state names
+        """
+        cities, _ = cls._get_tables()
+        row = cities.by_name.get((_normalize(name), _normalize(state_name)))
+        return cities.record(row) if row is not None else None
+
+    @classmethod
+    def get_zip_code(cls, zip_code_id: int) -> t.Optional[ZipCodeRecord]:
+        _, zip_codes = cls._get_tables()
+        row = zip_codes.by_id.get(zip_code_id)
+        return zip_codes.record(row) if row is not None else None
+
+    @classmethod
+    def get_zip_code_by_slug(cls, slug: str) -> t.Optional[ZipCodeRecord]:
+        _, zip_codes = cls._get_tables()
+        row = zip_codes.by_slug.get(slug)
+        return zip_codes.record(row) if row is not None else None
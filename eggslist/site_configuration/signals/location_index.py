@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from eggslist.site_configuration import models
+from eggslist.site_configuration.location_index import LocationIndex
+
+
+@receiver(post_save, sender=models.LocationCountry)
+@receiver(post_save, sender=models.LocationState)
+@receiver(post_save, sender=models.LocationCity)
+@receiver(post_save, sender=models.LocationZipCode)
+@receiver(post_delete, sender=models.LocationCountry)
+@receiver(post_delete, sender=models.LocationState)
+@receiver(post_delete, sender=models.LocationCity)
+@receiver(post_delete, sender=models.LocationZipCode)
+def invalidate_location_index(sender, **kwargs):
+    LocationIndex.invalidate()
+
+
+@receiver(post_migrate)
+def invalidate_location_index_after_migrate(sender, **kwargs):
+    # Data migrations like `0009_readd_locations` do not send model signals
+    LocationIndex.invalidate()
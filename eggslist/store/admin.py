@@ -5,6 +5,8 @@ from django.db.models.functions import Trunc
 from django.utils.translation import ngettext
 
 from eggslist.store import models
+from eggslist.store.catalog_candidate_storage import CatalogCandidateStorage
+from eggslist.users.models import UserStats
 from eggslist.utils.admin import ImageAdmin
 
 
@@ -70,7 +72,10 @@ class ProductArticleAdmin(ImageAdmin):
 
 
     def mark_as_archived(self, request, queryset):
+        seller_ids = set(queryset.values_list("seller_id", flat=True))
         updated = queryset.update(is_archived=True)
+        CatalogCandidateStorage.invalidate()
+        UserStats.objects.reconcile(user_ids=seller_ids)
         self.message_user(
             request,
             ngettext(
@@ -83,7 +88,10 @@ class ProductArticleAdmin(ImageAdmin):
         )
 
     def unmark_as_archived(self, request, queryset):
+        seller_ids = set(queryset.values_list("seller_id", flat=True))
         updated = queryset.update(is_archived=False)
+        CatalogCandidateStorage.invalidate()
+        UserStats.objects.reconcile(user_ids=seller_ids)
         self.message_user(
             request,
             ngettext(
@@ -198,3 +206,22 @@ class SalesStatisticsAdmin(admin.ModelAdmin):
         ]
 
         return response
+
+
+@admin.register(models.StripeWebhookEvent)
+class StripeWebhookEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "event_id",
+        "event_type",
+        "status",
+        "attempts",
+        "stripe_created",
+        "received_at",
+        "processed_at",
+    )
+    readonly_fields = list_display + ("ordering_key", "next_attempt_at", "last_error", "payload")
+    search_fields = ("event_id", "ordering_key")
+    list_filter = ("status", "event_type")
+
+    def has_add_permission(self, request):
+        return False
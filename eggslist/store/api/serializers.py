@@ -6,6 +6,8 @@ from rest_framework import serializers
 from eggslist.site_configuration.models import LocationZipCode
 from eggslist.store import article_create_rule, models
 from eggslist.store.api import messages
+from eggslist.store.constants import MORE_FROM_THIS_FARM, YOU_MAY_ALSO_LIKE
+from eggslist.users.models import UserFavoriteFarm
 
 User = get_user_model()
 
@@ -79,6 +81,45 @@ class ProductArticleSerializerSmall(ProductSerializerBase):
         fields = ("title", "image", "slug", "price", "seller", "is_out_of_stock")
 
 
+class ProductArticleRowSerializerSmall:
+    """
+    Build the same output as ProductArticleSerializerSmall out of flat
+    `RELATED_PRODUCT_FIELDS` rows without model instances
+    """
+
+    image_storage = models.ProductArticle._meta.get_field("image").storage
+    price_field = serializers.DecimalField(max_digits=8, decimal_places=2)
+
+    @classmethod
+    def to_representation(cls, row: t.Dict, is_favorite: bool) -> t.Dict:
+        return {
+            "title": row["title"],
+            "image": cls.image_storage.url(row["image"]) if row["image"] else None,
+            "slug": row["slug"],
+            "price": cls.price_field.to_representation(row["price"]),
+            "seller": {
+                "id": row["seller_id"],
+                "first_name": row["seller__first_name"],
+                "last_name": row["seller__last_name"],
+                "is_verified_seller": row["seller__is_verified_seller"],
+                "is_favorite": is_favorite,
+            },
+            "is_out_of_stock": row["is_out_of_stock"],
+        }
+
+
+class ProductArticleRowListSerializerSmall(serializers.BaseSerializer):
+    """
+    Read-only ProductArticleSerializerSmall of `CATALOG_ROW_FIELDS` rows
+    annotated with `seller__is_favorite`
+    """
+
+    def to_representation(self, row: t.Dict) -> t.Dict:
+        return ProductArticleRowSerializerSmall.to_representation(
+            row, is_favorite=row["seller__is_favorite"]
+        )
+
+
 class ProductArticleSerializerSmallMy(ProductSerializerBase):
     seller = SellerSerializerSmall(read_only=True)
 
@@ -123,19 +164,37 @@ class ProductArticleSerializer(ProductSerializerBase):
         )
         model = models.ProductArticle
 
+    def get_related_products(self, obj) -> t.Dict[str, t.List[t.Dict]]:
+        """
+        Both related lists are computed at once and kept on the object
+        """
+        if hasattr(obj, "_related_products"):
+            return obj._related_products
+
+        related_rows = models.ProductArticle.objects.get_related_for(
+            obj, location=self.context.get("location")
+        )
+
+        favorite_seller_ids = UserFavoriteFarm.objects.get_followed_seller_ids(
+            self.context["request"].user
+        )
+
+        obj._related_products = {
+            related_list: [
+                ProductArticleRowSerializerSmall.to_representation(
+                    row, is_favorite=row["seller_id"] in favorite_seller_ids
+                )
+                for row in rows
+            ]
+            for related_list, rows in related_rows.items()
+        }
+        return obj._related_products
+
     def get_you_may_also_like(self, obj):
-        user = self.context["request"].user
-        user_id = self.context["user_id"]
-        qs = models.ProductArticle.objects.get_best_similar_for(obj, user=user, user_id=user_id)
-        return ProductArticleSerializerSmall(qs, many=True).data
+        return self.get_related_products(obj)[YOU_MAY_ALSO_LIKE]
 
     def get_more_from_this_farm(self, obj):
-        user = self.context["request"].user
-        user_id = self.context["user_id"]
-        qs = models.ProductArticle.objects.get_from_the_same_farm_for(
-            obj, user=user, user_id=user_id
-        )
-        return ProductArticleSerializerSmall(qs, many=True).data
+        return self.get_related_products(obj)[MORE_FROM_THIS_FARM]
 
     def create(self, validated_data):
         try:
@@ -146,6 +205,13 @@ class ProductArticleSerializer(ProductSerializerBase):
             raise serializers.ValidationError({"popup": messages.SELLER_NEEDS_EMAIL_VERIFICATION})
 
 
+class SuggestionQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=64, help_text="Text typed by a user")
+    limit = serializers.IntegerField(
+        min_value=1, max_value=10, default=5, help_text="Number of suggestions of each kind"
+    )
+
+
 class TransactionProduct(serializers.ModelSerializer):
     slug = serializers.CharField(read_only=True)
     price = serializers.DecimalField(max_digits=8, decimal_places=2)
@@ -8,6 +8,7 @@ app_name = "store"
 urlpatterns = [
     path("categories", views.CategoryListAPIView.as_view(), name="categories"),
     path("products", views.ProductArticleListAPIView.as_view(), name="product-list"),
+    path("suggest", views.ProductSuggestAPIView.as_view(), name="suggest"),
     path("products/popular", views.PopularProductListAPIView.as_view(), name="product-popular"),
     path("products/recently-viewed", views.RecentlyViewedArticleListAPIView.as_view(), name="product-recently-viewed"),
     path("products/my", views.MyProductArticlesListAPIView.as_view(), name="product-my-articles"),
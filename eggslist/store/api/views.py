@@ -1,10 +1,13 @@
 import typing as t
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
 from django.db.models import DecimalField, ExpressionWrapper, Sum, Value
+from django.db.utils import OperationalError
 from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, generics, permissions
+from rest_framework import generics, permissions
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -12,26 +15,73 @@ from rest_framework.views import APIView
 
 from eggslist.store import models
 from eggslist.store.api import messages, serializers
-from eggslist.store.filters import ProductFilter
+from eggslist.store.checkout_session_storage import CheckoutSessionStorage
+from eggslist.store.constants import (
+    CATALOG_ROW_FIELDS,
+    CATEGORIES_CACHE_GENERATION,
+    PRODUCT_ARTICLES_CACHE_GENERATION,
+)
+from eggslist.store.filters import ProductFilter, ProductSearchFilter
+from eggslist.users.constants import FAVORITE_FARMS_CACHE_GENERATION
 from eggslist.users.permissions import IsVerifiedSeller
 from eggslist.utils.stripe import api as stripe_api
-from eggslist.utils.views.mixins import AnonymousUserIdAPIMixin
-from eggslist.utils.views.pagination import PageNumberPaginationWithCount
+from eggslist.utils.views.mixins import AnonymousUserIdAPIMixin, CacheResponseAPIMixin
+from eggslist.utils.views.pagination import (
+    PageNumberOrCursorPagination,
+    PageNumberPaginationWithCount,
+)
 
+User = get_user_model()
 
-class CategoryListAPIView(generics.ListAPIView):
+
+class CategoryListAPIView(CacheResponseAPIMixin, generics.ListAPIView):
     """Get Product Categories"""
 
-    cache_key = "categories"
+    response_cache_generations = (CATEGORIES_CACHE_GENERATION,)
     serializer_class = serializers.CategorySerializer
     queryset = models.Category.objects.all().prefetch_related("subcategories")
 
 
-class ProductCatalogPagination(PageNumberPaginationWithCount):
+class ProductCatalogPagination(PageNumberOrCursorPagination):
     page_size = 12
 
 
-class ProductArticleListAPIView(AnonymousUserIdAPIMixin, generics.ListAPIView):
+class TransactionPagination(PageNumberOrCursorPagination):
+    page_size = 20
+
+
+class CatalogResponseCacheMixin(CacheResponseAPIMixin):
+    """
+    Catalog pages are shared by visitors of the same location bucket. Pages of
+    authenticated users are stored per user because of `is_favorite` flags.
+    """
+
+    response_cache_per_user = True
+
+    def get_response_cache_generations(self, request) -> t.Sequence[str]:
+        generations = [PRODUCT_ARTICLES_CACHE_GENERATION]
+        if request.user.is_authenticated:
+            generations.append(FAVORITE_FARMS_CACHE_GENERATION.format(user_id=request.user.id))
+        return generations
+
+
+class CatalogRowsMixin:
+    """
+    Serialize catalog lists out of flat rows instead of model instances.
+    Only `CATALOG_ROW_FIELDS` and annotations are selected, after filters are
+    applied, so filters and ordering still work with the model queryset.
+    """
+
+    serializer_class = serializers.ProductArticleRowListSerializerSmall
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return queryset.values(*CATALOG_ROW_FIELDS, *queryset.query.annotations)
+
+
+class ProductArticleListAPIView(
+    CatalogRowsMixin, CatalogResponseCacheMixin, AnonymousUserIdAPIMixin, generics.ListAPIView
+):
     """
     Get Product Articles. Use filters as query parameters.
     Find query parameters information below.
@@ -39,32 +89,69 @@ class ProductArticleListAPIView(AnonymousUserIdAPIMixin, generics.ListAPIView):
     if it is provided in Cookie Session
     """
 
-    serializer_class = serializers.ProductArticleSerializerSmall
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter)
+    # Search goes first: it annotates `search_rank` used by `ordering=rank`
+    filter_backends = (ProductSearchFilter, DjangoFilterBackend)
     filterset_class = ProductFilter
-    search_fields = ("title", "description")
     pagination_class = ProductCatalogPagination
 
     def get_queryset(self):
         return models.ProductArticle.objects.get_all_catalog_no_hidden(
-            user=self.request.user, user_id=self.get_user_id()
+            user=self.request.user, location=self.get_user_location()
         )
 
 
-class PopularProductListAPIView(AnonymousUserIdAPIMixin, generics.ListAPIView):
+class PopularProductListAPIView(
+    CatalogRowsMixin, CatalogResponseCacheMixin, AnonymousUserIdAPIMixin, generics.ListAPIView
+):
     """
     Get Popular products near the user
     """
 
-    serializer_class = serializers.ProductArticleSerializerSmall
     pagination_class = ProductCatalogPagination
 
     def get_queryset(self):
         return models.ProductArticle.objects.get_all_catalog_no_hidden(
-            user=self.request.user, user_id=self.get_user_id()
+            user=self.request.user, location=self.get_user_location()
         )[:8]
 
 
+class ProductSuggestAPIView(APIView):
+    """
+    Typo-tolerant autocomplete for product titles, subcategories and farms.
+    Every lookup has a strict time budget. A lookup exceeding it returns no suggestions
+    instead of slowing the response down.
+    """
+
+    statement_timeout = 20  # ms
+
+    def run_within_budget(self, lookup: t.Callable[[], t.List[t.Dict]]) -> t.List[t.Dict]:
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL statement_timeout = %s", (self.statement_timeout,))
+                return lookup()
+        except OperationalError:
+            return []
+
+    def get(self, request, *args, **kwargs):
+        serializer = serializers.SuggestionQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query, limit = serializer.validated_data["q"], serializer.validated_data["limit"]
+        return Response(
+            {
+                "products": self.run_within_budget(
+                    lambda: models.ProductArticle.objects.get_suggestions(query, limit=limit)
+                ),
+                "subcategories": self.run_within_budget(
+                    lambda: models.Subcategory.objects.get_suggestions(query, limit=limit)
+                ),
+                "farms": self.run_within_budget(
+                    lambda: User.objects.get_farm_suggestions(query, limit=limit)
+                ),
+            }
+        )
+
+
 class ProfileProductPagination(PageNumberPaginationWithCount):
     page_size = 8
 
@@ -108,12 +195,11 @@ class MyHiddenProductArticlesListAPIView(generics.ListAPIView):
         return models.ProductArticle.objects.get_hidden_for(user=self.request.user)
 
 
-class OtherUserProductArticleListAPIView(generics.ListAPIView):
+class OtherUserProductArticleListAPIView(CatalogRowsMixin, generics.ListAPIView):
     """
     Get list of articles belonging to other users
     """
 
-    serializer_class = serializers.ProductArticleSerializerSmall
     pagination_class = ProfileProductPagination
     lookup_field = "seller_id"
 
@@ -132,9 +218,7 @@ class ProductArticleCreateAPIView(AnonymousUserIdAPIMixin, generics.CreateAPIVie
 
     def get_serializer_context(self) -> t.Dict:
         context = super().get_serializer_context()
-
-        if hasattr(self.request, "user"):
-            context.update(user_id=self.get_user_id())
+        context.update(location=self.get_user_location())
         return context
 
 
@@ -155,9 +239,7 @@ class ProductArticleDetailAPIView(AnonymousUserIdAPIMixin, generics.RetrieveUpda
 
     def get_serializer_context(self) -> t.Dict:
         context = super().get_serializer_context()
-
-        if hasattr(self.request, "user"):
-            context.update(user_id=self.get_user_id())
+        context.update(location=self.get_user_location())
         return context
 
     def get_object(self):
@@ -210,9 +292,32 @@ class ProductArticleContactButtonAPIView(APIView):
         return Response(status=200)
 
 
-class CreateTransactionAPIView(APIView):
+class CreateTransactionAPIView(AnonymousUserIdAPIMixin, APIView):
     lookup_field = "slug"
     permission_classes = (AllowAny,)
+    # Only the anonymous id is used
+    location_aware = False
+
+    def get_buyer(self) -> t.Optional[str]:
+        if self.request.user.is_authenticated:
+            return f"user:{self.request.user.id}"
+        anonymous_id = self.get_user_id()
+        return f"anonymous:{anonymous_id}" if anonymous_id else None
+
+    def create_checkout_session(self, product, stripe_connection) -> t.Tuple[int, str]:
+        transaction = models.Transaction.objects.create(
+            stripe_connection=stripe_connection,
+            product=product,
+            price=product.price,
+            application_fee=settings.STRIPE_APPLICATION_FEE,
+            seller=product.seller,
+            customer=self.request.user if self.request.user.is_authenticated else None,
+        )
+
+        purchase_url = stripe_api.create_purchase_url(
+            self.request.user, stripe_connection, product, transaction.id
+        )
+        return transaction.id, purchase_url
 
     def post(self, request, *args, **kwargs):
         product_slug = self.kwargs[self.lookup_field]
@@ -231,18 +336,20 @@ class CreateTransactionAPIView(APIView):
             raise ValidationError(
                 detail={"message": messages.SELLER_NEEDS_STRIPE_ONBOARDING_COMPLETED}
             )
-        transaction = models.Transaction.objects.create(
-            stripe_connection=stripe_connection,
-            product=product,
-            price=product.price,
-            application_fee=settings.STRIPE_APPLICATION_FEE,
-            seller=product.seller,
-            customer=request.user if request.user.is_authenticated else None,
-        )
 
-        purchase_url = stripe_api.create_purchase_url(
-            request.user, stripe_connection, product, transaction.id
-        )
+        buyer = self.get_buyer()
+        if buyer is None:
+            _, purchase_url = self.create_checkout_session(product, stripe_connection)
+        else:
+            purchase_url = CheckoutSessionStorage.get_url(
+                product.id,
+                buyer=buyer,
+                price=product.price,
+                loader=lambda: self.create_checkout_session(product, stripe_connection),
+                is_open=lambda transaction_id: models.Transaction.objects.filter(
+                    id=transaction_id, status=models.Transaction.Status.IN_PROGRESS
+                ).exists(),
+            )
         return Response({"redirect_url": purchase_url}, status=200)
 
 
@@ -250,8 +357,7 @@ class SellerTransactionsListAPIView(generics.GenericAPIView):
     permissions = (IsVerifiedSeller,)
     serializer_class = serializers.SellerTransactionListSerializer
     response_serializer_class = serializers.SellerTransactionListTotalSalesSerializer
-    pagination_class = PageNumberPaginationWithCount
-    pagination_class.page_size = 20
+    pagination_class = TransactionPagination
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -305,8 +411,7 @@ class SellerRecentTransactionListAPIView(generics.ListAPIView):
 
 class CustomerTransactionListAPIView(generics.ListAPIView):
     serializer_class = serializers.CustomerTransactionListSerializer
-    pagination_class = PageNumberPaginationWithCount
-    pagination_class.page_size = 20
+    pagination_class = TransactionPagination
 
     def get_queryset(self):
         return (
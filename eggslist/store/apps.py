@@ -9,3 +9,8 @@ class StoreAppsConfig(AppConfig):
 
     def ready(self):
         import eggslist.store.article_create_rule  # noqa
+        import eggslist.store.signals.catalog_cache  # noqa
+        import eggslist.store.signals.product_slug_index  # noqa
+        import eggslist.store.signals.seller_location  # noqa
+        import eggslist.store.signals.seller_stats  # noqa
+        import eggslist.store.signals.stripe_products  # noqa
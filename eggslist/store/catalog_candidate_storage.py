@@ -0,0 +1,47 @@
+import typing as t
+
+from django.core.cache import cache
+
+from eggslist.store.constants import PRODUCT_ARTICLES_CACHE_GENERATION
+from eggslist.utils import constants
+from eggslist.utils.cache_generation import CacheGeneration
+
+if t.TYPE_CHECKING:
+    from eggslist.users.user_location_storage import UserLocation
+
+
+class CatalogCandidateStorage:
+    """
+    Ids of visible product articles within a radius of a city. Visitors are bucketed
+    by (city, lookup radius), so the geo lookup runs once per bucket instead of once
+    per request. Any product article change bumps the generation and drops all of
+    the buckets.
+    """
+
+    _CANDIDATES_CACHE_KEY = "catalog_candidate_ids::{generation}::{city_id}::{lookup_radius}"
+    timeout = constants.ONE_HOUR
+
+    @classmethod
+    def _get_cache_key(cls, location: "UserLocation") -> str:
+        return cls._CANDIDATES_CACHE_KEY.format(
+            generation=CacheGeneration.get(PRODUCT_ARTICLES_CACHE_GENERATION),
+            city_id=location.city_id,
+            lookup_radius=location.lookup_radius,
+        )
+
+    @classmethod
+    def get_candidates(
+        cls, location: "UserLocation", loader: t.Callable[[], t.List[int]]
+    ) -> t.List[int]:
+        # The key is built once, so candidates loaded before a generation bump
+        # are never stored under the new generation
+        key = cls._get_cache_key(location)
+        candidates = cache.get(key)
+        if candidates is None:
+            candidates = loader()
+            cache.set(key, candidates, timeout=cls.timeout)
+        return candidates
+
+    @staticmethod
+    def invalidate():
+        CacheGeneration.bump(PRODUCT_ARTICLES_CACHE_GENERATION)
@@ -0,0 +1,47 @@
+import typing as t
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from eggslist.store.constants import CHECKOUT_SESSION_LIFETIME
+
+# (transaction id, checkout session URL)
+CheckoutSession = t.Tuple[int, str]
+
+
+class CheckoutSessionStorage:
+    """
+    Open Stripe Checkout sessions of buyers. Clicking "Buy" again while a
+    session of the same product and price is open returns its URL instead of
+    creating one more transaction and session.
+    """
+
+    _CHECKOUT_SESSION_CACHE_KEY = "checkout_session::{product_id}::{buyer}::{price}"
+    # Sessions are forgotten a bit before Stripe expires them
+    timeout = CHECKOUT_SESSION_LIFETIME - 5 * 60
+
+    @classmethod
+    def get_url(
+        cls,
+        product_id: int,
+        buyer: str,
+        price: Decimal,
+        loader: t.Callable[[], CheckoutSession],
+        is_open: t.Callable[[int], bool],
+    ) -> str:
+        """
+        `loader` creates a transaction and its session when there is no open one.
+        `is_open` tells whether a transaction of a stored session is not paid or failed yet
+        """
+        key = cls._CHECKOUT_SESSION_CACHE_KEY.format(
+            product_id=product_id, buyer=buyer, price=price
+        )
+        checkout_session = cache.get(key)
+        if checkout_session is not None:
+            transaction_id, url = checkout_session
+            if is_open(transaction_id):
+                return url
+
+        transaction_id, url = loader()
+        cache.set(key, (transaction_id, url), timeout=cls.timeout)
+        return url
@@ -4,3 +4,33 @@ SUBCATEGORY_CACHE_KEY = "subcategories"
 DELIVERY = "delivery"
 PICKUP = "pick_up"
 DELIVERY_OPTIONS = ((DELIVERY, "delivery"), (PICKUP, "pick up"))
+
+PRODUCT_ARTICLES_CACHE_GENERATION = "product_articles"
+CATEGORIES_CACHE_GENERATION = "categories"
+
+YOU_MAY_ALSO_LIKE = "you_may_also_like"
+MORE_FROM_THIS_FARM = "more_from_this_farm"
+RELATED_PRODUCTS_NUMBER = 4
+RELATED_PRODUCT_FIELDS = (
+    "title",
+    "image",
+    "slug",
+    "price",
+    "seller_id",
+    "seller__first_name",
+    "seller__last_name",
+    "seller__is_verified_seller",
+    "is_out_of_stock",
+)
+# Rows of catalog lists, extra fields are the ones catalog can be ordered by
+CATALOG_ROW_FIELDS = RELATED_PRODUCT_FIELDS + ("id", "engagement_count", "date_created")
+
+RECENTLY_VIEWED_PRODUCTS_NUMBER = 8
+# More views than shown are kept, some of the products may be hidden or archived later
+RECENTLY_VIEWED_PRODUCTS_CAPACITY = 20
+
+# Seconds a Stripe Checkout session stays open
+CHECKOUT_SESSION_LIFETIME = 60 * 60
+# Transactions still in progress after that are abandoned. Stripe has expired their
+# sessions by then, `reap_abandoned_transactions` only marks the transactions failed
+ABANDONED_TRANSACTION_AGE = CHECKOUT_SESSION_LIFETIME * 2
@@ -0,0 +1,113 @@
+import secrets
+import typing as t
+
+from redis.exceptions import ResponseError
+
+from eggslist.utils.redis import get_redis_client, make_key
+
+
+class ProductSlugIndex:
+    """
+    Redis hash of product article slugs to their ids. Product article signals keep
+    it up to date and it is rebuilt from scratch when missing, so a slug absent
+    from the index does not exist and is rejected without a query.
+    """
+
+    _SLUGS_CACHE_KEY = "product_slug_index"
+    _REBUILD_CACHE_KEY = "product_slug_index::rebuild::{token}"
+    rebuild_batch_size = 1000
+
+    @classmethod
+    def _rebuild(cls, loader: t.Callable[[], t.Iterable[t.Tuple[str, int]]]):
+        client = get_redis_client()
+        # Concurrent rebuilds do not share a key
+        rebuild_key = make_key(cls._REBUILD_CACHE_KEY.format(token=secrets.token_hex(6)))
+        batch = {}
+        for slug, article_id in loader():
+            batch[slug] = article_id
+            if len(batch) == cls.rebuild_batch_size:
+                client.hset(rebuild_key, mapping=batch)
+                batch = {}
+        if batch:
+            client.hset(rebuild_key, mapping=batch)
+        try:
+            # The index appears at once, it is never observed half built
+            client.rename(rebuild_key, make_key(cls._SLUGS_CACHE_KEY))
+        except ResponseError:
+            # There are no product articles
+            pass
+
+    @classmethod
+    def get_id(
+        cls, slug: str, loader: t.Callable[[], t.Iterable[t.Tuple[str, int]]]
+    ) -> t.Optional[int]:
+        """
+        Return id of the article with `slug`. `loader` provides all of the
+        (slug, id) pairs when the index has to be rebuilt
+        """
+        client = get_redis_client()
+        key = make_key(cls._SLUGS_CACHE_KEY)
+        article_id = client.hget(key, slug)
+        if article_id is None and not client.exists(key):
+            cls._rebuild(loader)
+            article_id = client.hget(key, slug)
+        return int(article_id) if article_id is not None else None
+
+    @classmethod
+    def add(cls, slug: str, article_id: int):
+        client = get_redis_client()
+        key = make_key(cls._SLUGS_CACHE_KEY)
+        # A missing index is left to the rebuild, otherwise it would look complete
+        if client.exists(key):
+            client.hset(key, slug, article_id)
+
+    @classmethod
+    def remove(cls, slug: str):
+        get_redis_client().hdel(make_key(cls._SLUGS_CACHE_KEY), slug)
+
+
+class EngagementCounter:
+    """
+    Write-behind counter of `Contact` button clicks. Clicks are accumulated in
+    a Redis hash of article id to delta and `ProductArticle.engagement_count`
+    is updated periodically by `flush_store_buffers` command.
+    """
+
+    _PENDING_CACHE_KEY = "engagement_counter::pending"
+    _FLUSHING_CACHE_KEY = "engagement_counter::flushing"
+
+    @classmethod
+    def increment(cls, article_id: int):
+        get_redis_client().hincrby(make_key(cls._PENDING_CACHE_KEY), article_id, 1)
+
+    @classmethod
+    def flush(cls, apply: t.Callable[[t.List[t.Tuple[int, int]]], t.Any]) -> int:
+        """
+        Pass accumulated deltas to `apply` and drop them once it succeeds.
+        Return the number of updated articles.
+
+        Pending clicks are renamed to a separate key first, so clicks arriving
+        during the flush are kept for the next one. Deltas of a flush which failed
+        are retried by the next flush before any new clicks.
+
+        Deltas are applied at least once: a flush stopped after `apply` committed
+        and before the deltas are dropped applies them again next time. Engagement
+        counts only rank articles, so a rare double count is accepted.
+        """
+        client = get_redis_client()
+        flushing_key = make_key(cls._FLUSHING_CACHE_KEY)
+        if not client.exists(flushing_key):
+            try:
+                client.rename(make_key(cls._PENDING_CACHE_KEY), flushing_key)
+            except ResponseError:
+                # No clicks since the last flush
+                return 0
+
+        deltas = [
+            (int(article_id), int(delta))
+            for article_id, delta in client.hgetall(flushing_key).items()
+        ]
+        if deltas:
+            apply(deltas)
+        client.delete(flushing_key)
+        return len(deltas)
@@ -1,7 +1,11 @@
 import django_filters as filters
 from django import forms
 from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast
 from django.db.utils import DatabaseError
+from rest_framework.filters import SearchFilter
 
 from eggslist.site_configuration.models import LocationZipCode
 from eggslist.store import models
@@ -42,6 +46,36 @@ class FavoriteFarmOrderingFilter(filters.OrderingFilter):
         return qs.order_by(*ordering)
 
 
+class ProductSearchFilter(SearchFilter):
+    """
+    Full-text search over ProductArticle `search_vector` keeping the `search`
+    query parameter of DRF SearchFilter. Titles similar to the search terms
+    (trigram word similarity) match as well, so typos like "chiken eggs" still
+    find products. It annotates a queryset with `search_rank` which is used to order
+    by `rank`, so it has to go before ProductFilter.
+    """
+
+    search_config = "english"
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = " ".join(self.get_search_terms(request))
+        if not search_terms:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        query = SearchQuery(search_terms, config=self.search_config)
+        return queryset.filter(
+            Q(search_vector=query) | Q(title__trigram_word_similar=search_terms)
+        ).annotate(
+            # `real` rank is cast to double precision, so cursors of `rank` ordering
+            # compare the same value they were built from
+            search_rank=Cast(
+                SearchRank(F("search_vector"), query)
+                + TrigramWordSimilarity(search_terms, "title"),
+                output_field=FloatField(),
+            )
+        )
+
+
 class ProductFilter(filters.FilterSet):
     price_from = filters.NumberFilter(
         field_name="price", lookup_expr="gt", help_text="Minimum price field."
@@ -62,12 +96,14 @@ class ProductFilter(filters.FilterSet):
             ("date_created", "Date Created"),
             ("-date_created", "Date Created (descending)"),
             ("proximity", "Proximety"),
+            ("rank", "Search Rank"),
         ),
         fields={
             "price": "price",
             "date_created": "date_created",
             "distance": "proximity",
             "-engagement_count": "relevance",
+            "-search_rank": "rank",
         },
     )
 
@@ -0,0 +1,103 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.measure import D
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from eggslist.site_configuration.models import LocationCity, LocationZipCode
+from eggslist.store.models import Category, ProductArticle, Subcategory
+from eggslist.utils.benchmark import BenchmarkRollback, format_result, measure
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure catalog radius query latency against synthetic articles spread across "
+        "all zip codes. The data is created in a transaction and rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=500_000)
+        parser.add_argument("--sellers", type=int, default=5_000)
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--radius", type=int, default=20, help="Lookup radius in miles")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["articles"], options["sellers"])
+                self.run(options["iterations"], options["radius"])
+                raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+
+    def seed(self, articles_number: int, sellers_number: int):
+        zip_codes = list(
+            LocationZipCode.objects.filter(location__isnull=False).values_list("id", "location")
+        )
+        category = Category.objects.create(name="Benchmark", image="benchmark.jpg")
+        subcategory = Subcategory.objects.create(name="Benchmark", category=category)
+
+        sellers = User.objects.bulk_create(
+            User(
+                email=f"benchmark-{i}@eggslist.com",
+                username=f"benchmark-{i}",
+                zip_code_id=random.choice(zip_codes)[0],
+            )
+            for i in range(sellers_number)
+        )
+        seller_locations = dict(zip_codes)
+
+        batch = []
+        for i in range(articles_number):
+            seller = random.choice(sellers)
+            batch.append(
+                ProductArticle(
+                    title=f"Benchmark article {i}",
+                    slug=f"benchmark-article-{i}",
+                    description="Benchmark article",
+                    subcategory=subcategory,
+                    price=random.randint(1, 100),
+                    seller=seller,
+                    seller_location=seller_locations[seller.zip_code_id],
+                    engagement_count=random.randint(0, 1000),
+                )
+            )
+            if len(batch) == 5000:
+                ProductArticle.objects.bulk_create(batch)
+                batch = []
+        ProductArticle.objects.bulk_create(batch)
+        self.stdout.write(f"Seeded {articles_number} articles of {sellers_number} sellers")
+
+    def run(self, iterations: int, radius: int):
+        cities = list(LocationCity.objects.filter(location__isnull=False))
+        manager = ProductArticle.objects
+        user = AnonymousUser()
+
+        def legacy_query():
+            city = random.choice(cities)
+            qs = manager.select_related(
+                "seller__zip_code__city__state", "seller__stripe_connection", "subcategory"
+            )
+            qs = qs.annotate(distance=Distance("seller__zip_code__location", city.location))
+            qs = manager._annotate_with_favorites(qs, user=user)
+            qs = qs.filter(is_hidden=False, is_archived=False, distance__lte=D(mi=radius))
+            list(qs.order_by("distance")[:12])
+
+        def seller_location_query():
+            city = random.choice(cities)
+            qs = manager.select_related("seller")
+            qs = manager._filter_within_radius(qs, point=city.location, lookup_radius=radius)
+            qs = manager._annotate_with_distance(qs, point=city.location)
+            qs = manager._annotate_with_favorites(qs, user=user)
+            list(qs.filter(is_hidden=False, is_archived=False).order_by("distance")[:12])
+
+        for name, query in (
+            ("join + exact distance", legacy_query),
+            ("seller location dwithin", seller_location_query),
+        ):
+            self.stdout.write(format_result(name, measure(query, iterations)))
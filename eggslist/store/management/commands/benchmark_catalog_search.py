@@ -0,0 +1,92 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+
+from eggslist.store.filters import ProductSearchFilter
+from eggslist.store.models import Category, ProductArticle, Subcategory
+from eggslist.utils.benchmark import BenchmarkRollback, format_result, measure
+
+User = get_user_model()
+
+VOCABULARY = (
+    "fresh farm eggs chicken duck goose quail organic free range pasture raised honey "
+    "raw milk goat cheese butter beef pork lamb sausage bacon vegetables tomatoes "
+    "potatoes carrots apples berries jam bread sourdough flowers seedlings herbs"
+).split()
+SEARCH_TERMS = ("eggs", "chicken eggs", "raw milk", "sourdough bread", "organic honey")
+
+
+class SearchView:
+    search_fields = ("title", "description")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare catalog search latency of DRF SearchFilter (icontains) with the full-text "
+        "search on synthetic articles. The data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=200_000)
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["articles"])
+                self.run(options["iterations"])
+                raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+
+    @staticmethod
+    def sentence(words_number: int) -> str:
+        return " ".join(random.choices(VOCABULARY, k=words_number))
+
+    def seed(self, articles_number: int):
+        category = Category.objects.create(name="Benchmark", image="benchmark.jpg")
+        subcategory = Subcategory.objects.create(name="Benchmark", category=category)
+        seller = User.objects.create(email="benchmark@eggslist.com", username="benchmark")
+
+        batch = []
+        for i in range(articles_number):
+            batch.append(
+                ProductArticle(
+                    title=self.sentence(4),
+                    slug=f"benchmark-article-{i}",
+                    description=self.sentence(60),
+                    subcategory=subcategory,
+                    price=random.randint(1, 100),
+                    seller=seller,
+                )
+            )
+            if len(batch) == 5000:
+                ProductArticle.objects.bulk_create(batch)
+                batch = []
+        ProductArticle.objects.bulk_create(batch)
+        self.stdout.write(f"Seeded {articles_number} articles")
+
+    def run(self, iterations: int):
+        request_factory = RequestFactory()
+        view = SearchView()
+
+        def search(search_filter):
+            def query():
+                request = Request(
+                    request_factory.get("/", {"search": random.choice(SEARCH_TERMS)})
+                )
+                qs = ProductArticle.objects.filter(is_hidden=False, is_archived=False)
+                list(search_filter.filter_queryset(request, qs, view)[:12])
+
+            return query
+
+        for name, search_filter in (
+            ("SearchFilter (icontains)", SearchFilter()),
+            ("full-text search", ProductSearchFilter()),
+        ):
+            self.stdout.write(format_result(name, measure(search(search_filter), iterations)))
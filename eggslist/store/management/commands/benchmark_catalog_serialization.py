@@ -0,0 +1,92 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from eggslist.store.api import serializers
+from eggslist.store.constants import CATALOG_ROW_FIELDS
+from eggslist.store.models import Category, ProductArticle, Subcategory
+from eggslist.utils.benchmark import BenchmarkRollback, format_result, measure
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare querying and serializing a catalog page with ProductArticleSerializerSmall "
+        "and with flat rows on synthetic articles. The data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=10_000)
+        parser.add_argument("--page-size", type=int, default=12)
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["articles"])
+                self.run(options["page_size"], options["iterations"])
+                raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+
+    def seed(self, articles_number: int):
+        category = Category.objects.create(name="Benchmark", image="benchmark.jpg")
+        subcategory = Subcategory.objects.create(name="Benchmark", category=category)
+        seller = User.objects.create(
+            email="benchmark@eggslist.com",
+            username="benchmark",
+            first_name="Benchmark",
+            last_name="Farm",
+        )
+
+        batch = []
+        for i in range(articles_number):
+            batch.append(
+                ProductArticle(
+                    title=f"Benchmark article {i}",
+                    slug=f"benchmark-article-{i}",
+                    description="Benchmark article " * 100,
+                    subcategory=subcategory,
+                    price=random.randint(1, 100),
+                    seller=seller,
+                    image=f"benchmark/{i}.jpg",
+                    engagement_count=random.randint(0, 1000),
+                )
+            )
+            if len(batch) == 5000:
+                ProductArticle.objects.bulk_create(batch)
+                batch = []
+        ProductArticle.objects.bulk_create(batch)
+        self.stdout.write(f"Seeded {articles_number} articles")
+
+    def run(self, page_size: int, iterations: int):
+        queryset = ProductArticle.objects.get_all_catalog_no_hidden(
+            user=AnonymousUser(), location=None
+        )
+        renderer = JSONRenderer()
+
+        def instances() -> bytes:
+            page = list(queryset[:page_size])
+            data = serializers.ProductArticleSerializerSmall(page, many=True).data
+            return renderer.render(data)
+
+        def rows() -> bytes:
+            page = list(
+                queryset.values(*CATALOG_ROW_FIELDS, *queryset.query.annotations)[:page_size]
+            )
+            data = serializers.ProductArticleRowListSerializerSmall(page, many=True).data
+            return renderer.render(data)
+
+        if instances() != rows():
+            raise CommandError("Row serialization output differs from the model serializer")
+
+        for name, serialize in (
+            ("model instances", instances),
+            ("flat rows", rows),
+        ):
+            self.stdout.write(format_result(name, measure(serialize, iterations)))
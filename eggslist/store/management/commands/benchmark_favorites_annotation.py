@@ -0,0 +1,95 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from eggslist.store.models import Category, ProductArticle, Subcategory
+from eggslist.users.models import UserFavoriteFarm
+from eggslist.utils.benchmark import BenchmarkRollback, format_result, measure
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare a catalog page ordered by favorite farms annotated with a correlated "
+        "EXISTS subquery and with the followed seller id set on synthetic articles. "
+        "The data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=200_000)
+        parser.add_argument("--sellers", type=int, default=5_000)
+        parser.add_argument("--followed", type=int, default=10, help="Farms the user follows")
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user = self.seed(options["articles"], options["sellers"], options["followed"])
+                self.run(user, options["iterations"])
+                raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+
+    def seed(self, articles_number: int, sellers_number: int, followed_number: int):
+        category = Category.objects.create(name="Benchmark", image="benchmark.jpg")
+        subcategory = Subcategory.objects.create(name="Benchmark", category=category)
+        sellers = User.objects.bulk_create(
+            User(email=f"benchmark-{i}@eggslist.com", username=f"benchmark-{i}")
+            for i in range(sellers_number)
+        )
+        user = User.objects.create(email="benchmark@eggslist.com", username="benchmark")
+        UserFavoriteFarm.objects.bulk_create(
+            UserFavoriteFarm(user=user, following_user=seller)
+            for seller in random.sample(sellers, followed_number)
+        )
+
+        batch = []
+        for i in range(articles_number):
+            batch.append(
+                ProductArticle(
+                    title=f"Benchmark article {i}",
+                    slug=f"benchmark-article-{i}",
+                    description="Benchmark article",
+                    subcategory=subcategory,
+                    price=random.randint(1, 100),
+                    seller=random.choice(sellers),
+                    engagement_count=random.randint(0, 1000),
+                )
+            )
+            if len(batch) == 5000:
+                ProductArticle.objects.bulk_create(batch)
+                batch = []
+        ProductArticle.objects.bulk_create(batch)
+        self.stdout.write(
+            f"Seeded {articles_number} articles of {sellers_number} sellers, "
+            f"{followed_number} of them are followed"
+        )
+        return User.objects.get(id=user.id)
+
+    def run(self, user, iterations: int):
+        manager = ProductArticle.objects
+        visible = manager.select_related("seller").filter(is_hidden=False, is_archived=False)
+        ordering = ("-seller__is_favorite", "-engagement_count")
+
+        def exists_subquery():
+            is_favorite = Exists(
+                UserFavoriteFarm.objects.filter(user=user, following_user=OuterRef("seller_id"))
+            )
+            qs = visible.annotate(seller__is_favorite=is_favorite)
+            list(qs.order_by(*ordering)[:12])
+
+        def followed_seller_set():
+            # A new request starts without the memoized set
+            user.__dict__.pop("_followed_seller_ids", None)
+            qs = manager._annotate_with_favorites(visible, user=user)
+            list(qs.order_by(*ordering)[:12])
+
+        for name, query in (
+            ("correlated EXISTS", exists_subquery),
+            ("followed seller id set", followed_seller_set),
+        ):
+            self.stdout.write(format_result(name, measure(query, iterations)))
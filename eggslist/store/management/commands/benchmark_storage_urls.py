@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from app.storage_backends import PublicMediaStorage
+from eggslist.utils.benchmark import format_result, measure
+
+PAGE_SIZES = (("catalog page", 12), ("admin list page", 100))
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the cost of media URLs built by S3Boto3Storage and by PublicMediaStorage "
+        "for a catalog page and an admin list page. No requests are sent to the bucket."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args, **options):
+        boto3_storage = S3Boto3Storage(location=PublicMediaStorage.location)
+        storage = PublicMediaStorage()
+
+        for page_name, page_size in PAGE_SIZES:
+            names = [f"product_articles/benchmark-{i}.jpg" for i in range(page_size)]
+            if [storage.url(name) for name in names] != [boto3_storage.url(n) for n in names]:
+                raise CommandError("PublicMediaStorage URLs differ from S3Boto3Storage URLs")
+
+            for storage_name, page_storage in (
+                ("S3Boto3Storage", boto3_storage),
+                ("PublicMediaStorage", storage),
+            ):
+                result = measure(
+                    lambda: [page_storage.url(name) for name in names], options["iterations"]
+                )
+                self.stdout.write(format_result(f"{storage_name}, {page_name}", result))
+                self.stdout.write(f"{'':<40} per item: {result['p50'] * 1000 / page_size:8.2f} us")
@@ -0,0 +1,93 @@
+import json
+import random
+import typing as t
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from eggslist.store.models import Category, ProductArticle, Subcategory
+from eggslist.store.query_plans import find_seq_scans, get_catalog_queries, get_plan
+from eggslist.utils.benchmark import BenchmarkRollback
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that queries of the store manager methods read product articles with index "
+        "scans on a seeded dataset. The data is rolled back afterwards. Exits with an "
+        "error when any query scans the whole table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=100_000)
+        parser.add_argument("--sellers", type=int, default=1_000)
+        parser.add_argument("--subcategories", type=int, default=50)
+        parser.add_argument("--verbose-plans", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                seller, subcategory = self.seed(
+                    options["articles"], options["sellers"], options["subcategories"]
+                )
+                failures = self.check(seller, subcategory, options["verbose_plans"])
+                raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+
+        if failures:
+            raise CommandError(f"Sequential scans of product articles: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All queries use indexes"))
+
+    def seed(self, articles_number: int, sellers_number: int, subcategories_number: int):
+        category = Category.objects.create(name="Benchmark", image="benchmark.jpg")
+        subcategories = Subcategory.objects.bulk_create(
+            Subcategory(name=f"Benchmark {i}", slug=f"benchmark-{i}", category=category)
+            for i in range(subcategories_number)
+        )
+        sellers = User.objects.bulk_create(
+            User(email=f"benchmark-{i}@eggslist.com", username=f"benchmark-{i}")
+            for i in range(sellers_number)
+        )
+
+        batch = []
+        for i in range(articles_number):
+            batch.append(
+                ProductArticle(
+                    title=f"Benchmark article {i}",
+                    slug=f"benchmark-article-{i}",
+                    description="Benchmark article",
+                    subcategory=random.choice(subcategories),
+                    price=random.randint(1, 100),
+                    seller=random.choice(sellers),
+                    engagement_count=random.randint(0, 1000),
+                    # Most of the catalog is visible like in production
+                    is_hidden=random.random() < 0.05,
+                    is_archived=random.random() < 0.2,
+                )
+            )
+            if len(batch) == 5000:
+                ProductArticle.objects.bulk_create(batch)
+                batch = []
+        ProductArticle.objects.bulk_create(batch)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {ProductArticle._meta.db_table}")
+        self.stdout.write(f"Seeded {articles_number} articles")
+        return sellers[0], subcategories[0]
+
+    def check(self, seller, subcategory, verbose_plans: bool) -> t.List[str]:
+        failures = []
+        for name, queryset in get_catalog_queries(seller, subcategory).items():
+            plan = get_plan(queryset)
+
+            if verbose_plans:
+                self.stdout.write(json.dumps(plan, indent=2))
+            if find_seq_scans(plan, relation=ProductArticle._meta.db_table):
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name:<40} sequential scan"))
+            else:
+                self.stdout.write(f"{name:<40} index scan")
+        return failures
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from eggslist.store.models import ProductArticle
+
+
+class Command(BaseCommand):
+    help = (
+        "Write buffered store data to the database: Contact button clicks "
+        "and recently viewed products"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep flushing every `--interval` seconds"
+        )
+        parser.add_argument("--interval", type=float, default=10.0)
+
+    def flush(self):
+        updated = ProductArticle.objects.flush_engagement_counts()
+        if updated:
+            self.stdout.write(f"Engagement counts of {updated} product articles were updated")
+        flushed = ProductArticle.objects.flush_recently_viewed()
+        if flushed:
+            self.stdout.write(f"Recently viewed products of {flushed} users were written")
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            self.flush()
+            return
+
+        while True:
+            started_at = time.monotonic()
+            try:
+                self.flush()
+            except Exception as e:
+                # A failed flush is retried by the next one
+                self.stderr.write(f"Flush failed: {e!r}")
+            time.sleep(max(options["interval"] - (time.monotonic() - started_at), 0))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from eggslist.utils.stripe.events import process_pending_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply Stripe webhook events recorded by the webhook endpoint. "
+        "Only one worker should run at a time"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep processing every `--interval` seconds"
+        )
+        parser.add_argument("--interval", type=float, default=1.0)
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def process(self, batch_size: int) -> int:
+        processed, failed = process_pending_events(batch_size=batch_size)
+        if processed or failed:
+            self.stdout.write(f"Stripe events processed: {processed}, failed: {failed}")
+        return processed + failed
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            while self.process(options["batch_size"]) == options["batch_size"]:
+                pass
+            return
+
+        while True:
+            try:
+                # Full batches are followed by the next one right away
+                if self.process(options["batch_size"]) == options["batch_size"]:
+                    continue
+            except Exception as e:
+                # Pending events are picked up by the next attempt
+                self.stderr.write(f"Processing failed: {e!r}")
+            time.sleep(options["interval"])
@@ -0,0 +1,58 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from eggslist.store.constants import ABANDONED_TRANSACTION_AGE
+from eggslist.store.models import Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark transactions which stayed in progress longer than their checkout sessions "
+        "live as failed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=ABANDONED_TRANSACTION_AGE,
+            help="Age of an abandoned transaction in seconds",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep reaping every `--interval` seconds"
+        )
+        parser.add_argument("--interval", type=float, default=60.0 * 30)
+
+    def reap(self, older_than: int, batch_size: int) -> int:
+        abandoned = Transaction.objects.filter(
+            status=Transaction.Status.IN_PROGRESS,
+            created_at__lt=timezone.now() - timedelta(seconds=older_than),
+        )
+        reaped = 0
+        while True:
+            # Short batches do not hold row locks for long
+            ids = list(abandoned.order_by("id").values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            reaped += abandoned.filter(id__in=ids).update(
+                status=Transaction.Status.FAILED, modified_at=timezone.now()
+            )
+        if reaped:
+            self.stdout.write(f"{reaped} abandoned transactions were marked failed")
+        return reaped
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            self.reap(options["older_than"], options["batch_size"])
+            return
+
+        while True:
+            try:
+                self.reap(options["older_than"], options["batch_size"])
+            except Exception as e:
+                self.stderr.write(f"Reaping failed: {e!r}")
+            time.sleep(options["interval"])
@@ -0,0 +1,127 @@
+import copy
+import hashlib
+import hmac
+import json
+import time
+import typing as t
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.urls import reverse
+
+from eggslist.store.models import StripeWebhookEvent
+from eggslist.utils.benchmark import BenchmarkRollback
+from eggslist.utils.stripe.events import process_pending_events
+from eggslist.utils.stripe.views import StripeWebhooks
+
+
+class Command(BaseCommand):
+    help = (
+        "Feed recorded Stripe events through the webhook endpoint and the event worker "
+        "and report their throughput. Fixtures are a JSON list or JSON lines of Stripe "
+        "events. The data is rolled back afterwards unless --commit is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("fixtures", help="Path to the recorded events")
+        parser.add_argument(
+            "--repeat", type=int, default=1, help="Replay copies of the events with new ids"
+        )
+        parser.add_argument(
+            "--duplicates",
+            action="store_true",
+            help="Deliver every event twice like Stripe retries",
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--commit",
+            action="store_true",
+            help="Keep the results. Emails of the processed events are sent as well",
+        )
+
+    @staticmethod
+    def load_events(path: str) -> t.List[t.Dict]:
+        with open(path) as fixtures:
+            content = fixtures.read().strip()
+        if content.startswith("["):
+            return json.loads(content)
+        return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    @staticmethod
+    def sign(payload: str) -> str:
+        timestamp = int(time.time())
+        signature = hmac.new(
+            settings.STRIPE_WEBHOOK_ENDPOINT_SECRET_KEY.encode(),
+            f"{timestamp}.{payload}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        return f"t={timestamp},v1={signature}"
+
+    def get_deliveries(self, events: t.List[t.Dict], repeat: int, duplicates: bool):
+        for copy_number in range(repeat):
+            for event in events:
+                if copy_number:
+                    event = copy.deepcopy(event)
+                    event["id"] = f"{event['id']}_replay_{copy_number}"
+                yield event
+                if duplicates:
+                    yield event
+
+    def handle(self, *args, **options):
+        events = self.load_events(options["fixtures"])
+        if not events:
+            raise CommandError("There are no events in the fixtures")
+
+        try:
+            with transaction.atomic():
+                self.replay(events, options)
+                if not options["commit"]:
+                    raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+
+    def replay(self, events: t.List[t.Dict], options: t.Dict):
+        request_factory = RequestFactory()
+        view = StripeWebhooks.as_view()
+        path = reverse("eggslist:stripe-webhook")
+
+        delivered, event_ids = 0, set()
+        started_at = time.perf_counter()
+        for event in self.get_deliveries(events, options["repeat"], options["duplicates"]):
+            payload = json.dumps(event)
+            request = request_factory.post(
+                path,
+                data=payload,
+                content_type="application/json",
+                HTTP_STRIPE_SIGNATURE=self.sign(payload),
+            )
+            response = view(request)
+            if response.status_code != 200:
+                raise CommandError(f"Event {event['id']} was rejected: {response.status_code}")
+            delivered += 1
+            event_ids.add(event["id"])
+        self.report("webhook endpoint", delivered, time.perf_counter() - started_at)
+
+        # Real events pending meanwhile are left to the worker
+        pending = StripeWebhookEvent.objects.filter(
+            status=StripeWebhookEvent.Status.PENDING, event_id__in=list(event_ids)
+        )
+        self.stdout.write(f"Recorded {pending.count()} of {delivered} deliveries")
+
+        processed = failed = 0
+        started_at = time.perf_counter()
+        while True:
+            batch_processed, batch_failed = process_pending_events(
+                options["batch_size"], event_ids=event_ids
+            )
+            if not batch_processed and not batch_failed:
+                break
+            processed, failed = processed + batch_processed, failed + batch_failed
+        self.report("event worker", processed + failed, time.perf_counter() - started_at)
+        self.stdout.write(f"Processed {processed} events, {failed} failed")
+
+    def report(self, name: str, number: int, seconds: float):
+        rate = number / seconds if seconds else 0
+        self.stdout.write(f"{name:<40} {number:6d} events {seconds:8.2f} s {rate:10.1f} events/s")
@@ -1,43 +1,211 @@
+import typing as t
+from datetime import datetime, timezone
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
 from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.geos.point import Point
 from django.contrib.gis.measure import D
-from django.db.models import Exists, F, Manager, OuterRef, Q, QuerySet, Value
+from django.contrib.postgres.search import TrigramSimilarity, TrigramWordSimilarity
+from django.db import connections, transaction
+from django.db.models import (
+    BooleanField,
+    ExpressionWrapper,
+    FloatField,
+    IntegerField,
+    Manager,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+)
+from django.db.models.expressions import RawSQL
 
+from eggslist.site_configuration.models import LocationZipCode
+from eggslist.store.constants import (
+    MORE_FROM_THIS_FARM,
+    RECENTLY_VIEWED_PRODUCTS_CAPACITY,
+    RECENTLY_VIEWED_PRODUCTS_NUMBER,
+    RELATED_PRODUCT_FIELDS,
+    RELATED_PRODUCTS_NUMBER,
+    YOU_MAY_ALSO_LIKE,
+)
+from eggslist.store.catalog_candidate_storage import CatalogCandidateStorage
+from eggslist.store.engagement_counter import EngagementCounter, ProductSlugIndex
+from eggslist.store.recently_viewed_storage import RecentlyViewedStorage
+from eggslist.store.related_products_storage import RelatedProducts, RelatedProductsStorage
 from eggslist.users.models import UserFavoriteFarm
-from eggslist.users.user_location_storage import UserLocationStorage
+from eggslist.users.user_location_storage import UserLocation
+
+
+class SubcategoryManager(Manager):
+    def get_suggestions(self, query: str, limit: int) -> t.List[t.Dict]:
+        return list(
+            self.filter(name__trigram_similar=query)
+            .annotate(similarity=TrigramSimilarity("name", query))
+            .order_by("-similarity")
+            .values("name", "slug")[:limit]
+        )
 
 
 class ProductArticlManager(Manager):
     def increase_engagement_count(self, slug: str):
-        updted_number = self.filter(slug=slug).update(engagement_count=F("engagement_count") + 1)
-        if updted_number == 0:
+        """
+        Count a click in EngagementCounter. Unknown slugs are rejected by ProductSlugIndex
+        """
+        article_id = ProductSlugIndex.get_id(
+            slug, loader=lambda: self.order_by().values_list("slug", "id").iterator()
+        )
+        if article_id is None:
             raise self.model.DoesNotExist()
+        EngagementCounter.increment(article_id)
+
+    def flush_engagement_counts(self) -> int:
+        """
+        Add clicks accumulated by EngagementCounter to `engagement_count`
+        with a single UPDATE per batch of articles
+        """
+        batch_size = 1000
+
+        def apply_deltas(deltas: t.List[t.Tuple[int, int]]):
+            # Rows are locked in the same order by every flush
+            deltas = sorted(deltas)
+            with transaction.atomic(using=self.db), connections[self.db].cursor() as cursor:
+                for start in range(0, len(deltas), batch_size):
+                    batch = deltas[start : start + batch_size]
+                    values = ", ".join(["(%s, %s)"] * len(batch))
+                    cursor.execute(
+                        f"UPDATE {self.model._meta.db_table} AS article "
+                        "SET engagement_count = article.engagement_count + delta.value "
+                        f"FROM (VALUES {values}) AS delta (id, value) "
+                        "WHERE article.id = delta.id",
+                        [param for row in batch for param in row],
+                    )
+
+        return EngagementCounter.flush(apply_deltas)
 
     def _annotate_with_favorites(self, qs, user):
         """
         Annotate a queryset with seller__is_favorite parameter. Use only with user.
         If user is not authenticated return Flase in seller__is_favorite
         """
-        if not user.is_authenticated:
+        followed_seller_ids = UserFavoriteFarm.objects.get_followed_seller_ids(user)
+        if not followed_seller_ids:
             return qs.annotate(seller__is_favorite=Value(False))
 
-        user_favorite_farms = Exists(
-            UserFavoriteFarm.objects.filter(user=user, following_user=OuterRef("seller_id"))
+        # A constant list of ids instead of a correlated subquery per row
+        is_favorite = ExpressionWrapper(
+            Q(seller_id__in=list(followed_seller_ids)), output_field=BooleanField()
         )
-        return qs.annotate(seller__is_favorite=user_favorite_farms)
+        return qs.annotate(seller__is_favorite=is_favorite)
 
-    def _annotate_with_distance(self, qs, city) -> QuerySet:
-        if city is None:
+    def sync_seller_location(self, seller_id: int):
+        """
+        Copy seller's zip code location to `seller_location` of all their articles
+        """
+        location = LocationZipCode.objects.filter(user__id=seller_id).values("location")[:1]
+        if self.filter(seller_id=seller_id).update(seller_location=Subquery(location)):
+            CatalogCandidateStorage.invalidate()
+
+    def _annotate_with_distance(self, qs, point: t.Optional[Point]) -> QuerySet:
+        """
+        Distance is not used in filters, so Postgres computes it only for the rows
+        which are sorted by it or returned within a page
+        """
+        if point is None:
             # This is to be consistent and always have distance measured.
-            # In this case all items will have 0 distance.
-            return qs.annotate(distance=Distance(Point(0, 0, srid=4326), Point(0, 0, srid=4326)))
-        return qs.annotate(distance=Distance("seller__zip_code__location", city.location))
+            # In this case all items will have 0 distance. A plain float like the cached
+            # distances, so it can be stored in a pagination cursor
+            return qs.annotate(distance=Value(0.0, output_field=FloatField()))
+        return qs.annotate(distance=Distance("seller_location", point))
+
+    def _filter_within_radius(self, qs, point: t.Optional[Point], lookup_radius: int) -> QuerySet:
+        """
+        Radius lookup over denormalized `seller_location`. ST_DWithin on a geography
+        column expands the point by the radius and uses the GiST index by itself
+        """
+        if point is None:
+            return qs
+        return qs.filter(seller_location__dwithin=(point, D(mi=lookup_radius)))
+
+    def _get_radius_candidates(self, location: UserLocation) -> t.List[int]:
+        def load_candidates() -> t.List[int]:
+            qs = self.filter(is_hidden=False, is_archived=False)
+            qs = self._filter_within_radius(
+                qs, point=location.point, lookup_radius=location.lookup_radius
+            )
+            return list(qs.order_by().values_list("id", flat=True))
+
+        return CatalogCandidateStorage.get_candidates(location, loader=load_candidates)
+
+    def _filter_radius_candidates(self, qs, location: t.Optional[UserLocation]) -> QuerySet:
+        """
+        Restrict a queryset to cached candidate ids of the (city, lookup radius) bucket.
+        Filters, ordering and pagination are applied on top of the candidate id set
+        without a geo lookup, distance is computed from the denormalized location
+        """
+        if location is None or location.point is None:
+            return self._annotate_with_distance(qs, point=None)
+
+        qs = qs.filter(id__in=self._get_radius_candidates(location))
+        return self._annotate_with_distance(qs, point=location.point)
+
+    def get_suggestions(self, query: str, limit: int) -> t.List[t.Dict]:
+        """
+        Autocomplete visible article titles tolerating typos. Flat rows only
+        """
+        return list(
+            self.filter(title__trigram_word_similar=query, is_hidden=False, is_archived=False)
+            .annotate(similarity=TrigramWordSimilarity(query, "title"))
+            .order_by("-similarity")
+            .values("title", "slug")[:limit]
+        )
 
     def get_recently_viewed_for(self, user):
-        qs = self.filter(user_view_timestamps__user=user, is_hidden=False, is_archived=False)
-        return self._annotate_with_favorites(qs, user).order_by(
-            "-user_view_timestamps__timestamp"
-        )[:8]
+        def load_views() -> t.List[t.Tuple[int, t.Any]]:
+            return list(
+                user.user_view_timestamps.order_by("-timestamp").values_list(
+                    "product_id", "timestamp"
+                )[:RECENTLY_VIEWED_PRODUCTS_CAPACITY]
+            )
+
+        product_ids = RecentlyViewedStorage.get_product_ids(user.id, loader=load_views)
+        qs = self.filter(id__in=product_ids, is_hidden=False, is_archived=False)
+        # Products keep the order of the sorted set
+        view_position = RawSQL(
+            f'array_position(%s::integer[], "{self.model._meta.db_table}"."id")',
+            (product_ids,),
+            output_field=IntegerField(),
+        )
+        qs = qs.annotate(view_position=view_position)
+        return self._annotate_with_favorites(qs, user).order_by("view_position")[
+            :RECENTLY_VIEWED_PRODUCTS_NUMBER
+        ]
+
+    def flush_recently_viewed(self) -> int:
+        """
+        Upsert views accumulated by RecentlyViewedStorage into UserViewTimestamp.
+        Views of deleted products and users are skipped
+        """
+        views_table = apps.get_model("store.UserViewTimestamp")._meta.db_table
+        users_table = get_user_model()._meta.db_table
+
+        def apply_views(views: t.List[t.Tuple[int, int, t.Any]]):
+            values = ", ".join(["(%s, %s, %s)"] * len(views))
+            with connections[self.db].cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO {views_table} (user_id, product_id, "timestamp") '
+                    "SELECT viewed.user_id, viewed.product_id, viewed.viewed_at "
+                    f"FROM (VALUES {values}) AS viewed (user_id, product_id, viewed_at) "
+                    f"JOIN {self.model._meta.db_table} AS product ON product.id = viewed.product_id "
+                    f"JOIN {users_table} AS viewer ON viewer.id = viewed.user_id "
+                    "ON CONFLICT (user_id, product_id) DO UPDATE "
+                    f'SET "timestamp" = GREATEST({views_table}."timestamp", EXCLUDED."timestamp")',
+                    # Rows are locked in the same order by every flush
+                    [param for view in sorted(views) for param in view],
+                )
+
+        return RecentlyViewedStorage.flush(apply_views)
 
     def get_for(self, user):
         return self.filter(seller=user, is_hidden=False, is_archived=False).select_related(
@@ -62,45 +230,101 @@ class ProductArticlManager(Manager):
             "seller__stripe_connection",
         )
 
-    def get_best_similar_for(self, instance, user, user_id) -> QuerySet:
-        city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(user_id=user_id)
-        qs = self.select_related(
-            "seller__zip_code__city__state", "seller__stripe_connection", "subcategory"
-        )
-        qs = self._annotate_with_distance(qs, city)
-        qs = self._annotate_with_favorites(qs, user=user)
-        return qs.filter(
-            ~Q(slug=instance.slug),
-            subcategory=instance.subcategory,
-            is_hidden=False,
-            is_archived=False,
-            distance__lte=D(mi=lookup_radius),
-        )[:4]
-
-    def get_from_the_same_farm_for(self, instance, user, user_id) -> QuerySet:
-        city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(user_id=user_id)
-        qs = self.select_related(
-            "seller__zip_code__city__state", "seller__stripe_connection", "subcategory"
-        )
-        qs = self._annotate_with_distance(qs, city)
-        qs = self._annotate_with_favorites(qs, user=user)
-        return qs.filter(
-            ~Q(slug=instance.slug), is_hidden=False, is_archived=False, seller=instance.seller
-        )[:4]
+    def get_related_for(self, instance, location: t.Optional[UserLocation]) -> RelatedProducts:
+        """
+        `You may also like` (same subcategory within the radius) and `More from this farm`
+        flat rows of a product computed in a single UNION ALL query and cached per
+        location bucket
+        """
 
-    def get_all_catalog_no_hidden(self, user, user_id) -> QuerySet:
-        city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(user_id=user_id)
-        qs = self.select_related(
-            "seller__zip_code__city__state", "seller__stripe_connection", "subcategory"
+        def load_related_products() -> RelatedProducts:
+            visible = self.filter(~Q(id=instance.id), is_hidden=False, is_archived=False)
+            similar = self._filter_radius_candidates(
+                visible.filter(subcategory_id=instance.subcategory_id), location=location
+            )
+            same_farm = visible.filter(seller_id=instance.seller_id)
+
+            fields = RELATED_PRODUCT_FIELDS + ("engagement_count", "related_list")
+            similar, same_farm = (
+                qs.annotate(related_list=Value(related_list))
+                .order_by("-engagement_count")
+                .values(*fields)[:RELATED_PRODUCTS_NUMBER]
+                for qs, related_list in (
+                    (similar, YOU_MAY_ALSO_LIKE),
+                    (same_farm, MORE_FROM_THIS_FARM),
+                )
+            )
+
+            related_products = {YOU_MAY_ALSO_LIKE: [], MORE_FROM_THIS_FARM: []}
+            for row in similar.union(same_farm, all=True):
+                related_products[row.pop("related_list")].append(row)
+            # UNION ALL does not keep the order of its parts
+            for rows in related_products.values():
+                rows.sort(key=lambda row: -row["engagement_count"])
+            return related_products
+
+        return RelatedProductsStorage.get_related_products(
+            instance.id, location=location, loader=load_related_products
         )
-        qs = self._annotate_with_distance(qs, city=city)
+
+    def get_all_catalog_no_hidden(self, user, location: t.Optional[UserLocation]) -> QuerySet:
+        qs = self.select_related("seller")
+        qs = self._filter_radius_candidates(qs, location=location)
         qs = self._annotate_with_favorites(qs, user=user)
-        return qs.filter(
-            is_hidden=False, is_archived=False, distance__lte=D(mi=int(lookup_radius))
-        )
+        return qs.filter(is_hidden=False, is_archived=False)
 
     def get_all_catalog_with_hidden(self, user, user_id):
         qs = self.filter(is_archived=False).select_related(
             "seller__zip_code__city__state", "seller__stripe_connection", "subcategory"
         )
         return self._annotate_with_favorites(qs, user=user)
+
+
+class StripeWebhookEventManager(Manager):
+    @staticmethod
+    def get_ordering_key(payload: t.Dict) -> str:
+        """
+        Events of the same key are processed in order. Checkout sessions and payment
+        intents refer to a transaction, account updates to a Stripe account
+        """
+        obj = payload.get("data", {}).get("object", {})
+        transaction_id = obj.get("client_reference_id") or obj.get("metadata", {}).get(
+            "transaction_id"
+        )
+        if transaction_id:
+            return f"transaction:{transaction_id}"
+        if obj.get("object") == "payment_intent":
+            return f"payment_intent:{obj.get('id')}"
+        return f"account:{payload.get('account')}"
+
+    def record(self, payload: t.Dict) -> bool:
+        """
+        Store a verified event for `process_stripe_events` command.
+        Return False when the event was already recorded
+        """
+        _, created = self.get_or_create(
+            event_id=payload["id"],
+            defaults={
+                "event_type": payload.get("type", ""),
+                "ordering_key": self.get_ordering_key(payload),
+                "stripe_created": datetime.fromtimestamp(payload["created"], tz=timezone.utc),
+                "payload": payload,
+            },
+        )
+        return created
+
+    def get_pending(self, limit: int, event_ids: t.Optional[t.Collection[str]] = None) -> QuerySet:
+        """
+        The oldest pending events due to be processed, only of `event_ids` when
+        given. Events behind a failed event of the same key wait until it is
+        processed or given up
+        """
+        pending = self.filter(status=self.model.Status.PENDING)
+        if event_ids is not None:
+            pending = pending.filter(event_id__in=list(event_ids))
+        waiting_keys = pending.filter(next_attempt_at__gt=datetime.now(tz=timezone.utc)).values(
+            "ordering_key"
+        )
+        return pending.exclude(ordering_key__in=waiting_keys).order_by("stripe_created", "id")[
+            :limit
+        ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.0.2 on 2026-10-18 10:12
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+FILL_SELLER_LOCATION = """
+UPDATE store_productarticle AS article
+SET seller_location = zip_code.location::geography
+FROM users_user AS seller
+JOIN site_configuration_locationzipcode AS zip_code ON zip_code.id = seller.zip_code_id
+WHERE article.seller_id = seller.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('site_configuration', '0009_readd_locations'),
+        ('users', '0010_userstripeconnection'),
+        ('store', '0012_alter_transaction_product'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productarticle',
+            name='seller_location',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, editable=False, geography=True, help_text="Copy of the seller's zip code location used for radius lookups", null=True, srid=4326, verbose_name='seller location'),
+        ),
+        migrations.RunSQL(FILL_SELLER_LOCATION, reverse_sql=migrations.RunSQL.noop),
+    ]
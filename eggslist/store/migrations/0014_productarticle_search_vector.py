@@ -0,0 +1,48 @@
+# Generated by Django 4.0.2 on 2026-10-18 11:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Title lexemes are weighted above description ones, so `ts_rank` prefers title matches
+CREATE_SEARCH_VECTOR_TRIGGER = """
+CREATE FUNCTION store_productarticle_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER store_productarticle_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, description, search_vector ON store_productarticle
+FOR EACH ROW EXECUTE PROCEDURE store_productarticle_search_vector_update();
+
+UPDATE store_productarticle SET search_vector = NULL;
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+DROP TRIGGER IF EXISTS store_productarticle_search_vector_trigger ON store_productarticle;
+DROP FUNCTION IF EXISTS store_productarticle_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0013_productarticle_seller_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productarticle',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Weighted title and description lexemes. Maintained by a database trigger', null=True, verbose_name='search vector'),
+        ),
+        migrations.AddIndex(
+            model_name='productarticle',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='productarticle_search_gin'),
+        ),
+        migrations.RunSQL(CREATE_SEARCH_VECTOR_TRIGGER, reverse_sql=DROP_SEARCH_VECTOR_TRIGGER),
+    ]
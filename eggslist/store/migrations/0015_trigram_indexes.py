@@ -0,0 +1,24 @@
+# Generated by Django 4.0.2 on 2026-10-18 11:48
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0014_productarticle_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='productarticle',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='productarticle_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='subcategory',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='subcategory_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.0.2 on 2026-10-18 19:12
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('store', '0015_trigram_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='productarticle',
+            index=models.Index(condition=models.Q(('is_archived', False), ('is_hidden', False)), fields=['-engagement_count'], name='productarticle_visible_popular'),
+        ),
+        AddIndexConcurrently(
+            model_name='productarticle',
+            index=models.Index(condition=models.Q(('is_archived', False), ('is_hidden', False)), fields=['subcategory', '-engagement_count'], name='productarticle_visible_subcat'),
+        ),
+        AddIndexConcurrently(
+            model_name='productarticle',
+            index=models.Index(condition=models.Q(('is_archived', False), ('is_hidden', False)), fields=['seller', 'date_created'], name='productarticle_visible_seller'),
+        ),
+        AddIndexConcurrently(
+            model_name='productarticle',
+            index=models.Index(condition=models.Q(('is_archived', False), ('is_hidden', False)), fields=['price'], name='productarticle_visible_price'),
+        ),
+        AddIndexConcurrently(
+            model_name='productarticle',
+            index=models.Index(condition=models.Q(('is_archived', False), ('is_hidden', False)), fields=['date_created'], name='productarticle_visible_created'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.0.2 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0016_visible_article_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StripeWebhookEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=255, unique=True, verbose_name='event id')),
+                ('event_type', models.CharField(max_length=80, verbose_name='event type')),
+                ('ordering_key', models.CharField(help_text='Events of the same transaction or account are processed in order', max_length=255, verbose_name='ordering key')),
+                ('stripe_created', models.DateTimeField(verbose_name='created in Stripe')),
+                ('payload', models.JSONField(verbose_name='payload')),
+                ('status', models.CharField(choices=[('PE', 'Pending'), ('PR', 'Processed'), ('FA', 'Failed')], default='PE', max_length=2, verbose_name='status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='attempts')),
+                ('next_attempt_at', models.DateTimeField(null=True, verbose_name='next attempt at')),
+                ('last_error', models.TextField(blank=True, verbose_name='last error')),
+                ('received_at', models.DateTimeField(auto_now_add=True, verbose_name='received at')),
+                ('processed_at', models.DateTimeField(null=True, verbose_name='processed at')),
+            ],
+            options={
+                'verbose_name': 'stripe webhook event',
+                'verbose_name_plural': 'stripe webhook events',
+                'ordering': ('-stripe_created',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='stripewebhookevent',
+            index=models.Index(condition=models.Q(('status', 'PE')), fields=['stripe_created', 'id'], name='stripewebhookevent_pending'),
+        ),
+    ]
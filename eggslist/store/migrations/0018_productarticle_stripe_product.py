@@ -0,0 +1,28 @@
+# Generated by Django 4.0.2 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0017_stripewebhookevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productarticle',
+            name='stripe_product_id',
+            field=models.CharField(editable=False, max_length=80, null=True, verbose_name='stripe product id'),
+        ),
+        migrations.AddField(
+            model_name='productarticle',
+            name='stripe_price_id',
+            field=models.CharField(editable=False, max_length=80, null=True, verbose_name='stripe price id'),
+        ),
+        migrations.AddField(
+            model_name='productarticle',
+            name='stripe_price_amount',
+            field=models.PositiveIntegerField(editable=False, help_text='Price in cents the Stripe price was created with', null=True, verbose_name='stripe price amount'),
+        ),
+    ]
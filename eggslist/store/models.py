@@ -1,13 +1,25 @@
+import typing as t
+
 from django.conf import settings
+from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from imagekit.models import ProcessedImageField
 from imagekit.processors import ResizeToFill
 
-from eggslist.store.managers import ProductArticlManager
+from eggslist.store.managers import (
+    ProductArticlManager,
+    StripeWebhookEventManager,
+    SubcategoryManager,
+)
+from eggslist.store.recently_viewed_storage import RecentlyViewedStorage
 from eggslist.utils.models import NameSlugModel, TitleSlugModel
 
+# Articles shown in the catalog, partial indexes cover only them
+VISIBLE_ARTICLES = models.Q(is_hidden=False, is_archived=False)
+
 
 class Category(NameSlugModel):
     image = ProcessedImageField(
@@ -31,10 +43,14 @@ class Subcategory(NameSlugModel):
         related_name="subcategories",
         on_delete=models.CASCADE,
     )
+    objects = SubcategoryManager()
 
     class Meta:
         verbose_name = _("subcategory")
         verbose_name_plural = _("subcategories")
+        indexes = (
+            GinIndex(fields=("name",), name="subcategory_name_trgm", opclasses=("gin_trgm_ops",)),
+        )
         constraints = (
             models.constraints.UniqueConstraint(
                 name="unique_subcategory", fields=("name", "category")
@@ -78,17 +94,104 @@ class ProductArticle(TitleSlugModel):
         default=False,
         help_text=_("Whether or not the item is shown in the store"),
     )
+    seller_location = gis_models.PointField(
+        verbose_name=_("seller location"),
+        help_text=_("Copy of the seller's zip code location used for radius lookups"),
+        geography=True,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    search_vector = SearchVectorField(
+        verbose_name=_("search vector"),
+        help_text=_("Weighted title and description lexemes. Maintained by a database trigger"),
+        null=True,
+        editable=False,
+    )
+    stripe_product_id = models.CharField(
+        verbose_name=_("stripe product id"), max_length=80, null=True, editable=False
+    )
+    stripe_price_id = models.CharField(
+        verbose_name=_("stripe price id"), max_length=80, null=True, editable=False
+    )
+    stripe_price_amount = models.PositiveIntegerField(
+        verbose_name=_("stripe price amount"),
+        help_text=_("Price in cents the Stripe price was created with"),
+        null=True,
+        editable=False,
+    )
     objects = ProductArticlManager()
 
+    STRIPE_PRODUCT_FIELDS = ("title", "description", "image", "price", "is_archived")
+
     class Meta:
         verbose_name = _("product article")
         verbose_name_plural = _("product articles")
         ordering = ("-engagement_count",)
+        indexes = (
+            GinIndex(fields=("search_vector",), name="productarticle_search_gin"),
+            GinIndex(
+                fields=("title",), name="productarticle_title_trgm", opclasses=("gin_trgm_ops",)
+            ),
+            # Catalog orderings and lookups of visible articles
+            models.Index(
+                fields=("-engagement_count",),
+                name="productarticle_visible_popular",
+                condition=VISIBLE_ARTICLES,
+            ),
+            models.Index(
+                fields=("subcategory", "-engagement_count"),
+                name="productarticle_visible_subcat",
+                condition=VISIBLE_ARTICLES,
+            ),
+            models.Index(
+                fields=("seller", "date_created"),
+                name="productarticle_visible_seller",
+                condition=VISIBLE_ARTICLES,
+            ),
+            models.Index(
+                fields=("price",), name="productarticle_visible_price", condition=VISIBLE_ARTICLES
+            ),
+            models.Index(
+                fields=("date_created",),
+                name="productarticle_visible_created",
+                condition=VISIBLE_ARTICLES,
+            ),
+        )
 
-    def user_viewed(self, user):
-        UserViewTimestamp.objects.update_or_create(
-            user=user, product=self, defaults={"timestamp": now()}
+    @staticmethod
+    def get_stats_counter(is_hidden: bool, is_archived: bool) -> t.Optional[str]:
+        """
+        Name of the seller's UserStats counter an article is counted in
+        """
+        if is_archived:
+            return None
+        return "hidden_products_count" if is_hidden else "active_products_count"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Seller stats are updated only when the counted state of an article changes
+        loaded = instance.__dict__
+        instance._loaded_stats_counter = (
+            loaded.get("seller_id"),
+            cls.get_stats_counter(loaded.get("is_hidden"), loaded.get("is_archived")),
         )
+        # The seller location is copied only when the seller changes
+        instance._loaded_seller_id = loaded.get("seller_id")
+        # Stripe product is synced only when its data changes
+        if all(field in loaded for field in cls.STRIPE_PRODUCT_FIELDS):
+            instance._loaded_stripe_product = instance.get_stripe_product()
+        return instance
+
+    def get_stripe_product(self) -> t.Tuple:
+        """
+        Article data its Stripe Product and Price are made of
+        """
+        return (self.title, self.description, self.image.name, self.price, self.is_archived)
+
+    def user_viewed(self, user):
+        RecentlyViewedStorage.add(user_id=user.id, product_id=self.id)
 
 
 class UserViewTimestamp(models.Model):
@@ -162,9 +265,59 @@ class Transaction(models.Model):
     )
     customer_email = models.CharField(max_length=256, verbose_name=_("customer_email"), null=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Successful sales of a seller are counted when the status changes
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
 
 class SaleStatistic(Transaction):
     class Meta:
         proxy = True
         verbose_name = "Sale Statistic"
         verbose_name_plural = "Sales Statistics"
+
+
+class StripeWebhookEvent(models.Model):
+    """
+    Inbox of verified Stripe webhook events processed by `process_stripe_events`
+    command. Stripe retries and duplicate deliveries are recorded once.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PE", _("Pending")
+        PROCESSED = "PR", _("Processed")
+        FAILED = "FA", _("Failed")
+
+    event_id = models.CharField(verbose_name=_("event id"), max_length=255, unique=True)
+    event_type = models.CharField(verbose_name=_("event type"), max_length=80)
+    ordering_key = models.CharField(
+        verbose_name=_("ordering key"),
+        max_length=255,
+        help_text=_("Events of the same transaction or account are processed in order"),
+    )
+    stripe_created = models.DateTimeField(verbose_name=_("created in Stripe"))
+    payload = models.JSONField(verbose_name=_("payload"))
+    status = models.CharField(
+        verbose_name=_("status"), max_length=2, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(verbose_name=_("attempts"), default=0)
+    next_attempt_at = models.DateTimeField(verbose_name=_("next attempt at"), null=True)
+    last_error = models.TextField(verbose_name=_("last error"), blank=True)
+    received_at = models.DateTimeField(verbose_name=_("received at"), auto_now_add=True)
+    processed_at = models.DateTimeField(verbose_name=_("processed at"), null=True)
+    objects = StripeWebhookEventManager()
+
+    class Meta:
+        verbose_name = _("stripe webhook event")
+        verbose_name_plural = _("stripe webhook events")
+        ordering = ("-stripe_created",)
+        indexes = (
+            models.Index(
+                fields=("stripe_created", "id"),
+                name="stripewebhookevent_pending",
+                condition=models.Q(status="PE"),
+            ),
+        )
@@ -0,0 +1,56 @@
+import json
+import typing as t
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.db.models import QuerySet
+
+from eggslist.store.models import ProductArticle
+
+
+def get_plan(queryset: QuerySet) -> t.Dict:
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def find_seq_scans(plan: t.Dict, relation: str) -> t.List[t.Dict]:
+    seq_scans = []
+    if plan["Node Type"] == "Seq Scan" and plan.get("Relation Name") == relation:
+        seq_scans.append(plan)
+    for subplan in plan.get("Plans", ()):
+        seq_scans.extend(find_seq_scans(subplan, relation))
+    return seq_scans
+
+
+def get_catalog_queries(seller, subcategory) -> t.Dict[str, QuerySet]:
+    """
+    Queries of the store manager methods which have to read product articles
+    with index scans
+    """
+    manager = ProductArticle.objects
+    user = AnonymousUser()
+    catalog = manager.get_all_catalog_no_hidden(user=user, location=None)
+    return {
+        "catalog by engagement": catalog.order_by("-engagement_count")[:12],
+        "catalog by price": catalog.order_by("price")[:12],
+        "catalog by date created": catalog.order_by("-date_created")[:12],
+        "catalog of a subcategory": catalog.filter(subcategory__slug=subcategory.slug)[:12],
+        "get_for": manager.get_for(seller)[:8],
+        "get_hidden_for": manager.get_hidden_for(seller)[:8],
+        "get_for_other": manager.get_for_other(user=user, other_user_id=seller.id)[:8],
+        "get_all_catalog_with_hidden": manager.get_all_catalog_with_hidden(
+            user=user, user_id=None
+        ).filter(slug="benchmark-article-0"),
+        # Parts of the get_related_for union
+        "related of a subcategory": manager.filter(
+            subcategory_id=subcategory.id, is_hidden=False, is_archived=False
+        ).order_by("-engagement_count")[:4],
+        "related of a farm": manager.filter(
+            seller_id=seller.id, is_hidden=False, is_archived=False
+        ).order_by("-engagement_count")[:4],
+    }
@@ -0,0 +1,104 @@
+import time
+import typing as t
+from datetime import datetime, timezone
+
+from eggslist.store.constants import RECENTLY_VIEWED_PRODUCTS_CAPACITY
+from eggslist.utils import constants
+from eggslist.utils.redis import get_redis_client, make_key
+
+# (user id, product id, timestamp)
+View = t.Tuple[int, int, datetime]
+
+
+class RecentlyViewedStorage:
+    """
+    Recently viewed products of a user in a Redis sorted set of product ids scored
+    by view time and capped at `capacity` most recent ones. Users with views not
+    written to `UserViewTimestamp` yet are kept in a separate set, and
+    `flush_store_buffers` command writes their views in bulk.
+    """
+
+    _VIEWS_CACHE_KEY = "recently_viewed::{user_id}"
+    _LOADED_CACHE_KEY = "recently_viewed::{user_id}::loaded"
+    _DIRTY_USERS_CACHE_KEY = "recently_viewed::dirty_users"
+    capacity = RECENTLY_VIEWED_PRODUCTS_CAPACITY
+    timeout = constants.ONE_HOUR * 24 * 7
+    flush_batch_size = 500
+
+    @classmethod
+    def _get_keys(cls, user_id: int) -> t.Tuple[str, str]:
+        return (
+            make_key(cls._VIEWS_CACHE_KEY.format(user_id=user_id)),
+            make_key(cls._LOADED_CACHE_KEY.format(user_id=user_id)),
+        )
+
+    @classmethod
+    def add(cls, user_id: int, product_id: int):
+        views_key, loaded_key = cls._get_keys(user_id)
+        pipeline = get_redis_client().pipeline()
+        pipeline.zadd(views_key, {product_id: time.time()})
+        pipeline.zremrangebyrank(views_key, 0, -cls.capacity - 1)
+        pipeline.expire(views_key, cls.timeout)
+        pipeline.sadd(make_key(cls._DIRTY_USERS_CACHE_KEY), user_id)
+        pipeline.execute()
+
+    @classmethod
+    def get_product_ids(
+        cls, user_id: int, loader: t.Callable[[], t.Iterable[t.Tuple[int, datetime]]]
+    ) -> t.List[int]:
+        """
+        Product ids from the most recently viewed. `loader` provides (product id, timestamp)
+        pairs stored in the database when the set is not loaded yet
+        """
+        client = get_redis_client()
+        views_key, loaded_key = cls._get_keys(user_id)
+        if not client.exists(loaded_key):
+            stored_views = {
+                product_id: timestamp.timestamp() for product_id, timestamp in loader()
+            }
+            pipeline = client.pipeline()
+            if stored_views:
+                # Views which are not flushed yet are newer than the stored ones
+                pipeline.zadd(views_key, stored_views, nx=True)
+                pipeline.zremrangebyrank(views_key, 0, -cls.capacity - 1)
+                pipeline.expire(views_key, cls.timeout)
+            pipeline.set(loaded_key, 1, ex=cls.timeout)
+            pipeline.execute()
+        return [int(product_id) for product_id in client.zrevrange(views_key, 0, -1)]
+
+    @classmethod
+    def flush(cls, apply: t.Callable[[t.List[View]], t.Any]) -> int:
+        """
+        Pass views of users with unflushed views to `apply` in batches.
+        Return the number of flushed users. Users of a failed batch are
+        flushed again next time.
+        """
+        client = get_redis_client()
+        dirty_users_key = make_key(cls._DIRTY_USERS_CACHE_KEY)
+        flushed = 0
+        while True:
+            user_ids = [
+                int(user_id) for user_id in client.spop(dirty_users_key, cls.flush_batch_size)
+            ]
+            if not user_ids:
+                return flushed
+
+            pipeline = client.pipeline()
+            for user_id in user_ids:
+                pipeline.zrange(cls._get_keys(user_id)[0], 0, -1, withscores=True)
+            views = [
+                (
+                    user_id,
+                    int(product_id),
+                    datetime.fromtimestamp(timestamp, tz=timezone.utc),
+                )
+                for user_id, user_views in zip(user_ids, pipeline.execute())
+                for product_id, timestamp in user_views
+            ]
+            try:
+                if views:
+                    apply(views)
+            except Exception:
+                client.sadd(dirty_users_key, *user_ids)
+                raise
+            flushed += len(user_ids)
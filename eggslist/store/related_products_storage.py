@@ -0,0 +1,45 @@
+import typing as t
+
+from django.core.cache import cache
+
+from eggslist.store.constants import PRODUCT_ARTICLES_CACHE_GENERATION
+from eggslist.utils.cache_generation import CacheGeneration
+
+if t.TYPE_CHECKING:
+    from eggslist.users.user_location_storage import UserLocation
+
+RelatedProducts = t.Dict[str, t.List[t.Dict]]
+
+
+class RelatedProductsStorage:
+    """
+    `You may also like` and `More from this farm` rows of a product per
+    (city, lookup radius) bucket. Rows do not depend on a user, favorites are
+    applied on top of them. Any product article change bumps the generation
+    and drops all of the stored lists.
+    """
+
+    _RELATED_PRODUCTS_CACHE_KEY = (
+        "related_products::{generation}::{product_id}::{city_id}::{lookup_radius}"
+    )
+    # Seller names are a part of the rows and do not bump the generation
+    timeout = 60 * 10
+
+    @classmethod
+    def get_related_products(
+        cls,
+        product_id: int,
+        location: t.Optional["UserLocation"],
+        loader: t.Callable[[], RelatedProducts],
+    ) -> RelatedProducts:
+        key = cls._RELATED_PRODUCTS_CACHE_KEY.format(
+            generation=CacheGeneration.get(PRODUCT_ARTICLES_CACHE_GENERATION),
+            product_id=product_id,
+            city_id=location.city_id if location is not None else None,
+            lookup_radius=location.lookup_radius if location is not None else None,
+        )
+        related_products = cache.get(key)
+        if related_products is None:
+            related_products = loader()
+            cache.set(key, related_products, timeout=cls.timeout)
+        return related_products
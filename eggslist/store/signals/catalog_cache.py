@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eggslist.store import models
+from eggslist.store.catalog_candidate_storage import CatalogCandidateStorage
+from eggslist.store.constants import CATEGORIES_CACHE_GENERATION
+from eggslist.utils.cache_generation import CacheGeneration
+
+
+@receiver(post_save, sender=models.ProductArticle)
+@receiver(post_delete, sender=models.ProductArticle)
+def invalidate_catalog_candidates(sender, instance: models.ProductArticle, **kwargs):
+    CatalogCandidateStorage.invalidate()
+
+
+@receiver(post_save, sender=models.Category)
+@receiver(post_save, sender=models.Subcategory)
+@receiver(post_delete, sender=models.Category)
+@receiver(post_delete, sender=models.Subcategory)
+def invalidate_categories(sender, **kwargs):
+    CacheGeneration.bump(CATEGORIES_CACHE_GENERATION)
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eggslist.store import models
+from eggslist.store.engagement_counter import ProductSlugIndex
+
+
+@receiver(post_save, sender=models.ProductArticle)
+def add_product_slug(sender, instance: models.ProductArticle, **kwargs):
+    ProductSlugIndex.add(instance.slug, article_id=instance.id)
+
+
+@receiver(post_delete, sender=models.ProductArticle)
+def remove_product_slug(sender, instance: models.ProductArticle, **kwargs):
+    ProductSlugIndex.remove(instance.slug)
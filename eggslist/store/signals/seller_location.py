@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from eggslist.site_configuration.models import LocationZipCode
+from eggslist.store import models
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=models.ProductArticle)
+def copy_seller_location(sender, instance: models.ProductArticle, **kwargs):
+    if not instance._state.adding and instance.seller_id == getattr(
+        instance, "_loaded_seller_id", None
+    ):
+        return
+    instance.seller_location = (
+        LocationZipCode.objects.filter(user__id=instance.seller_id)
+        .values_list("location", flat=True)
+        .first()
+    )
+    instance._loaded_seller_id = instance.seller_id
+
+
+@receiver(post_save, sender=User)
+def sync_seller_location(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    if update_fields is not None and "zip_code" not in update_fields:
+        return
+
+    loaded_zip_code_id = getattr(instance, "_loaded_zip_code_id", None)
+    if not created and instance.zip_code_id != loaded_zip_code_id:
+        models.ProductArticle.objects.sync_seller_location(seller_id=instance.id)
+    instance._loaded_zip_code_id = instance.zip_code_id
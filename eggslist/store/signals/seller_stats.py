@@ -0,0 +1,57 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eggslist.store import models
+from eggslist.users.models import UserStats
+
+
+@receiver(post_save, sender=models.ProductArticle)
+def update_products_count(sender, instance: models.ProductArticle, created: bool, **kwargs):
+    current = (
+        instance.seller_id,
+        instance.get_stats_counter(instance.is_hidden, instance.is_archived),
+    )
+    if not created and not hasattr(instance, "_loaded_stats_counter"):
+        # The previous state is unknown when an article was not loaded from the database
+        UserStats.objects.reconcile(user_ids=[instance.seller_id])
+        instance._loaded_stats_counter = current
+        return
+
+    loaded = (None, None) if created else instance._loaded_stats_counter
+    if loaded != current:
+        loaded_seller_id, loaded_counter = loaded
+        if loaded_counter is not None:
+            UserStats.objects.increment(loaded_seller_id, **{loaded_counter: -1})
+        seller_id, counter = current
+        if counter is not None:
+            UserStats.objects.increment(seller_id, **{counter: 1})
+    instance._loaded_stats_counter = current
+
+
+@receiver(post_delete, sender=models.ProductArticle)
+def decrease_products_count(sender, instance: models.ProductArticle, **kwargs):
+    seller_id, counter = getattr(
+        instance,
+        "_loaded_stats_counter",
+        (instance.seller_id, instance.get_stats_counter(instance.is_hidden, instance.is_archived)),
+    )
+    if counter is not None:
+        UserStats.objects.increment(seller_id, **{counter: -1})
+
+
+@receiver(post_save, sender=models.Transaction)
+def update_successful_sales_count(sender, instance: models.Transaction, created: bool, **kwargs):
+    success = models.Transaction.Status.SUCCESS
+    was_successful = not created and getattr(instance, "_loaded_status", None) == success
+    is_successful = instance.status == success
+    if was_successful != is_successful:
+        UserStats.objects.increment(
+            instance.seller_id, successful_sales_count=1 if is_successful else -1
+        )
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=models.Transaction)
+def decrease_successful_sales_count(sender, instance: models.Transaction, **kwargs):
+    if getattr(instance, "_loaded_status", instance.status) == models.Transaction.Status.SUCCESS:
+        UserStats.objects.increment(instance.seller_id, successful_sales_count=-1)
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from eggslist.store import models
+from eggslist.utils.stripe.products import StripeProductSync
+
+
+@receiver(post_save, sender=models.ProductArticle)
+def sync_stripe_product(
+    sender, instance: models.ProductArticle, created: bool, update_fields=None, **kwargs
+):
+    if update_fields is not None and not set(update_fields) & set(
+        models.ProductArticle.STRIPE_PRODUCT_FIELDS
+    ):
+        return
+    stripe_product = instance.get_stripe_product()
+    # Unknown when an article was not loaded from the database
+    loaded_stripe_product = getattr(instance, "_loaded_stripe_product", None)
+    instance._loaded_stripe_product = stripe_product
+    if not created and stripe_product == loaded_stripe_product:
+        return
+    transaction.on_commit(lambda: StripeProductSync.schedule(instance.id))
@@ -0,0 +1,58 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from eggslist.store.models import Category, ProductArticle, Subcategory
+from eggslist.store.query_plans import find_seq_scans, get_catalog_queries, get_plan
+
+User = get_user_model()
+
+
+class CatalogQueryPlansTestCase(TestCase):
+    """
+    Queries of the store manager methods must be able to read product articles
+    through indexes. Sequential scans are disabled, so the planner falls back to
+    one only when no index (or partial index condition) matches a query.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        randomizer = random.Random(0)
+        category = Category.objects.create(name="Plans", image="plans.jpg")
+        subcategories = Subcategory.objects.bulk_create(
+            Subcategory(name=f"Plans {i}", slug=f"plans-{i}", category=category) for i in range(5)
+        )
+        sellers = User.objects.bulk_create(
+            User(email=f"plans-{i}@eggslist.com", username=f"plans-{i}") for i in range(20)
+        )
+        ProductArticle.objects.bulk_create(
+            ProductArticle(
+                title=f"Plans article {i}",
+                slug=f"benchmark-article-{i}",
+                description="Plans article",
+                subcategory=randomizer.choice(subcategories),
+                price=randomizer.randint(1, 100),
+                seller=randomizer.choice(sellers),
+                engagement_count=randomizer.randint(0, 1000),
+                is_hidden=randomizer.random() < 0.05,
+                is_archived=randomizer.random() < 0.2,
+            )
+            for i in range(2000)
+        )
+        cls.seller, cls.subcategory = sellers[0], subcategories[0]
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {ProductArticle._meta.db_table}")
+            # Reset with the transaction of the test
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def test_manager_queries_use_indexes(self):
+        for name, queryset in get_catalog_queries(self.seller, self.subcategory).items():
+            with self.subTest(query=name):
+                plan = get_plan(queryset)
+                self.assertEqual(
+                    find_seq_scans(plan, relation=ProductArticle._meta.db_table), [], plan
+                )
@@ -6,7 +6,6 @@ from django.db.utils import IntegrityError
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
-from eggslist.blogs.models import BlogArticle
 from eggslist.site_configuration.models import LocationCity, LocationZipCode
 from eggslist.users import models
 from eggslist.users.api import messages
@@ -81,9 +80,13 @@ class EmailVerifyConfirmSerializer(serializers.Serializer):
 
 
 class UserLocationSerializer(serializers.ModelSerializer):
+    """
+    Serializes LocationIndex city records
+    """
+
     city = serializers.CharField(source="name")
-    state = serializers.CharField(source="state.name")
-    country = serializers.CharField(source="state.country.name")
+    state = serializers.CharField(source="state_name")
+    country = serializers.CharField(source="country_name")
     lookup_radius = serializers.SerializerMethodField()
     is_undefined = serializers.SerializerMethodField()
 
@@ -115,6 +118,24 @@ class SetLocationSerializer(serializers.Serializer):
     )
 
 
+class UserStatsSerializer(serializers.ModelSerializer):
+    """
+    Stats of a user, used with `source="*"`
+    """
+
+    def to_representation(self, user):
+        return super().to_representation(models.UserStats.objects.get_for(user))
+
+    class Meta:
+        model = models.UserStats
+        fields = (
+            "active_products_count",
+            "followers_count",
+            "blog_articles_count",
+            "successful_sales_count",
+        )
+
+
 class UserSerializerSmall(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -140,9 +161,10 @@ class UserSerializer(serializers.ModelSerializer):
         slug_field="slug", write_only=True, queryset=LocationZipCode.objects.all(), required=False
     )
     has_posted_blogs = serializers.SerializerMethodField()
+    stats = UserStatsSerializer(read_only=True, source="*")
 
     def get_has_posted_blogs(self, user):
-        return BlogArticle.objects.filter(author=user).exists()
+        return models.UserStats.objects.get_for(user).blog_articles_count > 0
 
     class Meta:
         model = User
@@ -162,6 +184,7 @@ class UserSerializer(serializers.ModelSerializer):
             "bio",
             "zip_code",
             "has_posted_blogs",
+            "stats",
         )
 
 
@@ -179,9 +202,10 @@ class OtherUserSerializer(serializers.ModelSerializer):
     )
     is_favorite = serializers.BooleanField(read_only=True)
     has_posted_blogs = serializers.SerializerMethodField()
+    stats = UserStatsSerializer(read_only=True, source="*")
 
     def get_has_posted_blogs(self, user):
-        return BlogArticle.objects.filter(author=user).exists()
+        return models.UserStats.objects.get_for(user).blog_articles_count > 0
 
     class Meta:
         model = User
@@ -198,6 +222,7 @@ class OtherUserSerializer(serializers.ModelSerializer):
             "bio",
             "is_favorite",
             "has_posted_blogs",
+            "stats",
         )
 
 
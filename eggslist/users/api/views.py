@@ -15,13 +15,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from eggslist.site_configuration.models import LocationCity
+from eggslist.site_configuration.location_index import LocationIndex
 from eggslist.users import models
 from eggslist.users.permissions import IsVerifiedSeller
 from eggslist.users.user_code_verify import PasswordResetCodeVerification, UserEmailVerification
 from eggslist.users.user_location_storage import UserLocationStorage
-from eggslist.utils.emailing import send_mailing
 from eggslist.utils.stripe import api as stripe_api
+from eggslist.utils.stripe.onboarding import OnboardingStatus
 from eggslist.utils.views.mixins import AnonymousUserIdAPIMixin, JWTMixin
 from . import messages, serializers
 
@@ -98,20 +98,12 @@ class UserProfileAPIView(RetrieveUpdateAPIView):
 
 class UserProfileFullAPIView(UserProfileAPIView):
     def retrieve(self, request, *args, **kwargs):
-        # Verify if Stripe onboarding completed
+        # Stripe answer may be known before it is stored
         user = self.request.user
-        if (
-            hasattr(user, "stripe_connection")
-            and not user.stripe_connection.is_onboarding_completed
+        if hasattr(user, "stripe_connection") and OnboardingStatus.is_completed(
+            user.stripe_connection
         ):
-            if stripe_api.is_onboarding_completed(user.stripe_connection):
-                user.stripe_connection.is_onboarding_completed = True
-                user.stripe_connection.save()
-                send_mailing(
-                    subject="Stripe",
-                    mail_template="emails/stripe_connected.html",
-                    users=[user],
-                )
+            user.stripe_connection.is_onboarding_completed = True
         return super().retrieve(request, *args, **kwargs)
 
 
@@ -219,15 +211,19 @@ class LocationAPIView(AnonymousUserIdAPIMixin, RetrieveAPIView):
     serializer_class = serializers.UserLocationSerializer
 
     def get_location_instance(self):
-        return UserLocationStorage.get_user_location(user_id=self.get_user_id())
+        location = self.get_user_location()
+        if location is None:
+            return None
+        return LocationIndex.get_city(location.city_id)
 
     def retrieve(self, request, *args, **kwargs):
-        location_instance, lookup_radius, is_undefined = UserLocationStorage.get_user_location(
-            user_id=self.get_user_id()
-        )
+        location = self.get_user_location()
         serializer = self.get_serializer(
-            location_instance,
-            context={"lookup_radius": lookup_radius, "is_undefined": is_undefined},
+            self.get_location_instance(),
+            context={
+                "lookup_radius": location.lookup_radius if location is not None else None,
+                "is_undefined": location.is_undefined if location is not None else None,
+            },
         )
         return Response(serializer.data)
 
@@ -242,11 +238,8 @@ class SetLocationAPIView(AnonymousUserIdAPIMixin, GenericAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        try:
-            city_location_instance = LocationCity.objects.get(
-                slug=serializer.validated_data["slug"]
-            )
-        except LocationCity.DoesNotExist:
+        city_location_instance = LocationIndex.get_city_by_slug(serializer.validated_data["slug"])
+        if city_location_instance is None:
             raise Http404
         UserLocationStorage.set_user_location(
             user_id=self.get_user_id(),
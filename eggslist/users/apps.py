@@ -11,3 +11,5 @@ class UsersAppsConfig(AppConfig):
         import eggslist.users.signals.user_create_rule  # noqa
         import eggslist.users.signals.verified_seller_application  # noqa
         import eggslist.users.signals.change_password_notification  # noqa
+        import eggslist.users.signals.favorite_farms  # noqa
+        import eggslist.users.signals.user_stats  # noqa
@@ -2,3 +2,6 @@ PENDING = 0
 APPROVED = 1
 REFUSED = 2
 APPLICATION_STATUS = ((PENDING, "pending"), (APPROVED, "approved"), (REFUSED, "refused"))
+
+# Generation of favorite farms of a single user
+FAVORITE_FARMS_CACHE_GENERATION = "favorite_farms::{user_id}"
@@ -1,48 +1,89 @@
+import ipaddress
 import typing as t
 
 from django.conf import settings
 from django.contrib.gis.geoip2 import GeoIP2
 from geoip2.errors import AddressNotFoundError
 
-from eggslist.site_configuration.models import LocationCity
+from eggslist.site_configuration.location_index import CityRecord, LocationIndex
 from eggslist.users import exceptions
-from eggslist.users.models import UserIPLocationLog
+from eggslist.users.ip_location_log import ip_location_log_writer
+from eggslist.utils.lru import MISSING, LRUCache
 
 if t.TYPE_CHECKING:
     from django.http import HttpRequest
 
+# Addresses of a /24 (IPv4) or /64 (IPv6) network are resolved to the same city
+IPV4_PREFIX_LENGTH = 24
+IPV6_PREFIX_LENGTH = 64
+IP_PREFIX_CACHE_SIZE = 50_000
 
-def locate_ip(ip_address: str) -> t.Optional[str]:
-    geo_locator = GeoIP2()
+# Resolved city id of an IP prefix, None when the prefix can not be located
+_ip_prefix_cities = LRUCache(maxsize=IP_PREFIX_CACHE_SIZE)
+_geo_locator: t.Optional[GeoIP2] = None
+
+
+def get_geo_locator() -> GeoIP2:
+    """
+    GeoIP2 reader shared by a worker. The database is memory mapped once
+    instead of being reopened for every visitor
+    """
+    global _geo_locator
+    if _geo_locator is None:
+        _geo_locator = GeoIP2(cache=GeoIP2.MODE_MMAP)
+    return _geo_locator
+
+
+def get_ip_prefix(ip_address: str) -> str:
+    address = ipaddress.ip_address(ip_address)
+    prefix_length = IPV4_PREFIX_LENGTH if address.version == 4 else IPV6_PREFIX_LENGTH
+    return str(ipaddress.ip_network(f"{address}/{prefix_length}", strict=False))
+
+
+def _resolve_ip(ip_address: str) -> t.Optional[CityRecord]:
     try:
-        location = geo_locator.city(ip_address)
+        location = get_geo_locator().city(ip_address)
     except AddressNotFoundError:
-        UserIPLocationLog.objects.create(
-            ip_address=ip_address, determined_city="GeoIP2 didn't find it"
+        ip_location_log_writer.write(ip_address, determined_city="GeoIP2 didn't find it")
+        return None
+
+    user_location = LocationIndex.get_city_by_name(
+        location.get("city") or "", state_name=location.get("region") or ""
+    )
+    if user_location is None:
+        ip_location_log_writer.write(
+            ip_address, determined_city=location.get("city") or "LocationCity.DoesNotExist"
         )
-        raise exceptions.LocationNotFound
+    return user_location
+
+
+def locate_ip(ip_address: str) -> CityRecord:
     try:
-        user_location = LocationCity.objects.select_related("state__country").get(
-            name__iexact=location.get("city", ""), state__name__iexact=location.get("region", "")
-        )
-    except LocationCity.DoesNotExist:
-        UserIPLocationLog.objects.create(
-            ip_address=ip_address,
-            determined_city=location.get("city", "LocationCity.DoesNotExist"),
-        )
+        ip_prefix = get_ip_prefix(ip_address)
+    except ValueError:
         raise exceptions.LocationNotFound
 
+    city_id = _ip_prefix_cities.get(ip_prefix)
+    if city_id is MISSING:
+        user_location = _resolve_ip(ip_address)
+        # Misses are cached too, unknown networks are logged once per worker
+        _ip_prefix_cities.set(ip_prefix, user_location.id if user_location else None)
+    else:
+        user_location = LocationIndex.get_city(city_id) if city_id is not None else None
+
+    if user_location is None:
+        raise exceptions.LocationNotFound
     return user_location
 
 
-def locate_request(request: "HttpRequest") -> t.Tuple["LocationCity", bool]:
+def locate_request(request: "HttpRequest") -> t.Tuple[CityRecord, bool]:
     ip_address = request.META[settings.IP_ADDRESS_REQUEST_META_KEY]
     try:
         location_city = locate_ip(ip_address)
         is_undefined = False
     except exceptions.LocationNotFound:
-        location_city = LocationCity.objects.get(
-            name=settings.DEFAULT_LOCATION["CITY"], state__name=settings.DEFAULT_LOCATION["STATE"]
+        location_city = LocationIndex.get_city_by_name(
+            settings.DEFAULT_LOCATION["CITY"], state_name=settings.DEFAULT_LOCATION["STATE"]
         )
         is_undefined = True
 
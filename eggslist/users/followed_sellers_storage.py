@@ -0,0 +1,34 @@
+import typing as t
+
+from django.core.cache import cache
+
+from eggslist.utils import constants
+
+
+class FollowedSellersStorage:
+    """
+    Ids of farms a user follows. A user follows a handful of farms, so the set is
+    loaded once and checked in memory or passed to queries as a list of ids.
+    The set is memoized on the user object for the rest of a request.
+    """
+
+    _FOLLOWED_SELLERS_CACHE_KEY = "followed_sellers::{user_id}"
+    timeout = constants.ONE_HOUR
+
+    @classmethod
+    def get_seller_ids(cls, user, loader: t.Callable[[], t.Iterable[int]]) -> t.FrozenSet[int]:
+        seller_ids = getattr(user, "_followed_seller_ids", None)
+        if seller_ids is not None:
+            return seller_ids
+
+        key = cls._FOLLOWED_SELLERS_CACHE_KEY.format(user_id=user.id)
+        seller_ids = cache.get(key)
+        if seller_ids is None:
+            seller_ids = frozenset(loader())
+            cache.set(key, seller_ids, timeout=cls.timeout)
+        user._followed_seller_ids = seller_ids
+        return seller_ids
+
+    @classmethod
+    def invalidate(cls, user_id: int):
+        cache.delete(cls._FOLLOWED_SELLERS_CACHE_KEY.format(user_id=user_id))
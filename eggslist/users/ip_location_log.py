@@ -0,0 +1,74 @@
+import atexit
+import logging
+import threading
+import typing as t
+
+from django.db import DatabaseError, connection
+
+from eggslist.users.models import UserIPLocationLog
+
+logger = logging.getLogger(__name__)
+
+
+class IPLocationLogWriter:
+    """
+    Buffer of `UserIPLocationLog` rows written by a background thread with one
+    bulk insert per `flush_interval` seconds or per `batch_size` rows. Requests
+    only append to the buffer. When the database falls behind the buffer is
+    capped at `max_buffer_size` rows and the newest rows are dropped, so a flood
+    of unknown IPs can not exhaust worker's memory.
+    """
+
+    flush_interval = 5
+    batch_size = 500
+    max_buffer_size = 10_000
+
+    def __init__(self):
+        self._buffer: t.List[UserIPLocationLog] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: t.Optional[threading.Thread] = None
+
+    def write(self, ip_address: str, determined_city: str):
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer_size:
+                return
+            self._buffer.append(
+                UserIPLocationLog(ip_address=ip_address, determined_city=determined_city)
+            )
+            buffer_size = len(self._buffer)
+            self._ensure_started()
+        if buffer_size >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_started(self):
+        # Started lazily, so the thread belongs to a forked worker and not to the master
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="ip-location-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return
+        try:
+            UserIPLocationLog.objects.bulk_create(rows, batch_size=self.batch_size)
+        except DatabaseError:
+            logger.exception("Could not write %s IP location log rows", len(rows))
+        finally:
+            # The thread owns its connection, it should not stay open between flushes
+            connection.close()
+
+
+ip_location_log_writer = IPLocationLogWriter()
+atexit.register(ip_location_log_writer.flush)
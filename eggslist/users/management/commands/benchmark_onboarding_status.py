@@ -0,0 +1,55 @@
+import time
+from unittest import mock
+
+import stripe
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from eggslist.users.models import UserStripeConnection
+from eggslist.utils.benchmark import format_result, measure
+from eggslist.utils.stripe import api as stripe_api
+from eggslist.utils.stripe.onboarding import OnboardingStatus
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the onboarding check of a profile request calling Stripe inline and "
+        "reading OnboardingStatus. Stripe is replaced by a stub answering after "
+        "--stripe-latency milliseconds, no requests are sent to Stripe."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stripe-latency", type=float, default=300.0)
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        stripe_calls = []
+
+        def retrieve_account(stripe_account, **kwargs):
+            stripe_calls.append(stripe_account)
+            time.sleep(options["stripe_latency"] / 1000)
+            return stripe.Account.construct_from(
+                {"id": stripe_account, "details_submitted": False}, stripe.api_key
+            )
+
+        # Not saved, so the benchmark leaves no data behind
+        stripe_connection = UserStripeConnection(stripe_account="acct_benchmark")
+        status_key = OnboardingStatus._STATUS_CACHE_KEY.format(
+            stripe_account=stripe_connection.stripe_account
+        )
+
+        with mock.patch.object(stripe.Account, "retrieve", side_effect=retrieve_account):
+            for name, check in (
+                (
+                    "inline Stripe call",
+                    lambda: stripe_api.is_onboarding_completed(stripe_connection),
+                ),
+                ("OnboardingStatus", lambda: OnboardingStatus.is_completed(stripe_connection)),
+            ):
+                cache.delete(status_key)
+                stripe_calls.clear()
+                self.stdout.write(format_result(name, measure(check, options["iterations"])))
+                # Let the background refresh finish before the calls are counted
+                time.sleep(options["stripe_latency"] / 1000 * 2)
+                self.stdout.write(f"{'':<40} Stripe calls: {len(stripe_calls)}")
+        cache.delete(status_key)
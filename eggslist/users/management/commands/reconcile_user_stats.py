@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from eggslist.users.models import UserStats
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized user stats from products, followers, blog articles and sales"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id", type=int, action="append", dest="user_ids", help="Limit to a user"
+        )
+
+    def handle(self, *args, **options):
+        changed = UserStats.objects.reconcile(user_ids=options["user_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Stats of {changed} users were fixed"))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from eggslist.utils.email_outbox import EmailOutbox
+
+
+class Command(BaseCommand):
+    help = "Send emails queued to EmailOutbox. Only one worker should run at a time"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep sending every `--interval` seconds"
+        )
+        parser.add_argument("--interval", type=float, default=2.0)
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def send(self, batch_size: int) -> int:
+        sent = EmailOutbox.send(batch_size=batch_size)
+        if sent:
+            self.stdout.write(f"{sent} emails were sent")
+        return sent
+
+    def handle(self, *args, **options):
+        requeued = EmailOutbox.requeue_processing()
+        if requeued:
+            self.stdout.write(f"{requeued} emails of a stopped worker were queued again")
+
+        if not options["loop"]:
+            while self.send(options["batch_size"]):
+                pass
+            return
+
+        while True:
+            try:
+                # Full batches are followed by the next one right away
+                if self.send(options["batch_size"]) == options["batch_size"]:
+                    continue
+            except Exception as e:
+                # Queued emails are sent by the next attempt
+                self.stderr.write(f"Sending failed: {e!r}")
+            time.sleep(options["interval"])
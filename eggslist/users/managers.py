@@ -1,12 +1,28 @@
 import secrets
+import typing as t
 
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager
+from django.contrib.postgres.search import TrigramSimilarity
 from django.db import IntegrityError
-from django.db.models import Exists, Manager, OuterRef, Value
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    ExpressionWrapper,
+    F,
+    Manager,
+    OuterRef,
+    Q,
+    Value,
+)
+from django.db.models.functions import Greatest
 
+from eggslist.site_configuration.location_index import LocationIndex
 from eggslist.site_configuration.models import LocationZipCode
+from eggslist.users.followed_sellers_storage import FollowedSellersStorage
 
 
 class EggslistUserManager(UserManager):
@@ -39,25 +55,171 @@ class EggslistUserManager(UserManager):
         self.filter(email=email).update(is_email_verified=True)
 
     def update_location(self, email: str, zip_code_slug: str):
-        zip_code = LocationZipCode.objects.get(slug=zip_code_slug)
-        self.filter(email=email).update(zip_code=zip_code)
+        ProductArticle = apps.get_model("store.ProductArticle")
+        zip_code = LocationIndex.get_zip_code_by_slug(zip_code_slug)
+        if zip_code is None:
+            raise LocationZipCode.DoesNotExist()
+        self.filter(email=email).update(zip_code_id=zip_code.id)
+        for seller_id in self.filter(email=email).values_list("id", flat=True):
+            ProductArticle.objects.sync_seller_location(seller_id=seller_id)
 
     def get_queryset(self):
         return super().get_queryset().select_related("zip_code__city__state__country")
 
     def get_for_user(self, user):
         UserFavoriteFarm = apps.get_model("users.UserFavoriteFarm")
-        if user.is_authenticated:
-            user_favorite_farms = UserFavoriteFarm.objects.filter(
-                user=user, following_user=OuterRef("id")
-            ).values("following_user")
-            return self.annotate(is_favorite=Exists(user_favorite_farms))
-        return self.annotate(is_favorite=Value(False))
+        followed_seller_ids = UserFavoriteFarm.objects.get_followed_seller_ids(user)
+        # Profiles of other users show their stats
+        qs = self.select_related("stats")
+        if not followed_seller_ids:
+            return qs.annotate(is_favorite=Value(False))
+        return qs.annotate(
+            is_favorite=ExpressionWrapper(
+                Q(id__in=list(followed_seller_ids)), output_field=BooleanField()
+            )
+        )
+
+    def get_farm_suggestions(self, query: str, limit: int):
+        """
+        Autocomplete names of sellers having visible articles. Flat rows only
+        """
+        ProductArticle = apps.get_model("store.ProductArticle")
+        visible_articles = ProductArticle.objects.filter(
+            seller_id=OuterRef("id"), is_hidden=False, is_archived=False
+        )
+        return list(
+            self.filter(Q(first_name__trigram_similar=query) | Q(last_name__trigram_similar=query))
+            .filter(Exists(visible_articles))
+            .annotate(
+                similarity=Greatest(
+                    TrigramSimilarity("first_name", query), TrigramSimilarity("last_name", query)
+                )
+            )
+            .order_by("-similarity")
+            .values("id", "first_name", "last_name")[:limit]
+        )
 
 
 class UserFavoriteFarmManager(Manager):
+    def get_followed_seller_ids(self, user) -> t.FrozenSet[int]:
+        """
+        Ids of farms followed by `user`, empty for anonymous users
+        """
+        if not user.is_authenticated:
+            return frozenset()
+        return FollowedSellersStorage.get_seller_ids(
+            user,
+            loader=lambda: self.filter(user_id=user.id).values_list(
+                "following_user_id", flat=True
+            ),
+        )
+
     def create_or_delete(self, user_id, following_user_id):
         try:
             self.create(user_id=user_id, following_user_id=following_user_id)
         except IntegrityError:
             self.filter(user_id=user_id, following_user_id=following_user_id).delete()
+
+
+class UserStatsManager(Manager):
+    def increment(self, user_id: int, **deltas: int):
+        """
+        Add `deltas` to the counters of a user, e.g. `increment(1, followers_count=-1)`
+        """
+        updated = self.filter(user_id=user_id).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+        if not updated:
+            # Stats of users created before the table existed are computed from scratch
+            self.reconcile(user_ids=[user_id])
+
+    def get_for(self, user):
+        """
+        Stats of a user. Rows are created by a post_save signal, so users added with
+        `bulk_create` or raw SQL have none until they are computed here
+        """
+        stats = getattr(user, "stats", None)
+        if stats is None:
+            self.reconcile(user_ids=[user.id])
+            stats = self.get(user_id=user.id)
+            user.stats = stats
+        return stats
+
+    @staticmethod
+    def _count_by(model, group_field: str, **filters) -> t.Dict[int, int]:
+        rows = (
+            model.objects.filter(**filters)
+            .order_by()
+            .values(group_field)
+            .annotate(count=Count("pk"))
+            .values_list(group_field, "count")
+        )
+        return dict(rows)
+
+    def reconcile(self, user_ids: t.Optional[t.Iterable[int]] = None) -> int:
+        """
+        Recompute stats of `user_ids` or of all users from the source tables.
+        Return the number of users whose stats were changed
+        """
+        User = apps.get_model(settings.AUTH_USER_MODEL)
+        ProductArticle = apps.get_model("store.ProductArticle")
+        Transaction = apps.get_model("store.Transaction")
+        UserFavoriteFarm = apps.get_model("users.UserFavoriteFarm")
+        BlogArticle = apps.get_model("blogs.BlogArticle")
+        users = User.objects.order_by()
+        if user_ids is not None:
+            users = users.filter(id__in=list(user_ids))
+        is_partial = user_ids is not None
+        user_ids = list(users.values_list("id", flat=True))
+
+        def of_users(field: str) -> t.Dict:
+            # Counting everything is cheaper than passing all of the ids
+            return {f"{field}__in": user_ids} if is_partial else {}
+
+        counters = {
+            "active_products_count": self._count_by(
+                ProductArticle,
+                "seller_id",
+                **of_users("seller_id"),
+                is_hidden=False,
+                is_archived=False,
+            ),
+            "hidden_products_count": self._count_by(
+                ProductArticle,
+                "seller_id",
+                **of_users("seller_id"),
+                is_hidden=True,
+                is_archived=False,
+            ),
+            "followers_count": self._count_by(
+                UserFavoriteFarm, "following_user_id", **of_users("following_user_id")
+            ),
+            "blog_articles_count": self._count_by(
+                BlogArticle, "author_id", **of_users("author_id")
+            ),
+            "successful_sales_count": self._count_by(
+                Transaction,
+                "seller_id",
+                **of_users("seller_id"),
+                status=Transaction.Status.SUCCESS,
+            ),
+        }
+
+        existing = self.in_bulk(user_ids if is_partial else None)
+        to_create, to_update = [], []
+        for user_id in user_ids:
+            values = {field: counts.get(user_id, 0) for field, counts in counters.items()}
+            stats = existing.get(user_id)
+            if stats is None:
+                stats = self.model(user_id=user_id)
+                to_create.append(stats)
+            elif any(getattr(stats, field) != value for field, value in values.items()):
+                to_update.append(stats)
+            else:
+                continue
+            for field, value in values.items():
+                setattr(stats, field, value)
+
+        self.bulk_create(to_create, batch_size=1000, ignore_conflicts=True)
+        self.bulk_update(to_update, fields=list(counters), batch_size=1000)
+        return len(to_create) + len(to_update)
@@ -0,0 +1,56 @@
+# Generated by Django 4.0.2 on 2026-10-18 15:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0002_alter_blogarticle_image'),
+        ('store', '0015_trigram_indexes'),
+        ('users', '0011_user_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='user')),
+                ('active_products_count', models.IntegerField(default=0, verbose_name='active products count')),
+                ('hidden_products_count', models.IntegerField(default=0, verbose_name='hidden products count')),
+                ('followers_count', models.IntegerField(default=0, verbose_name='followers count')),
+                ('blog_articles_count', models.IntegerField(default=0, verbose_name='blog articles count')),
+                ('successful_sales_count', models.IntegerField(default=0, verbose_name='successful sales count')),
+            ],
+            options={
+                'verbose_name': 'user stats',
+                'verbose_name_plural': 'user stats',
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO users_userstats (
+                    user_id,
+                    active_products_count,
+                    hidden_products_count,
+                    followers_count,
+                    blog_articles_count,
+                    successful_sales_count
+                )
+                SELECT
+                    u.id,
+                    (SELECT COUNT(*) FROM store_productarticle p
+                     WHERE p.seller_id = u.id AND NOT p.is_hidden AND NOT p.is_archived),
+                    (SELECT COUNT(*) FROM store_productarticle p
+                     WHERE p.seller_id = u.id AND p.is_hidden AND NOT p.is_archived),
+                    (SELECT COUNT(*) FROM users_userfavoritefarm f WHERE f.following_user_id = u.id),
+                    (SELECT COUNT(*) FROM blogs_blogarticle b WHERE b.author_id = u.id),
+                    (SELECT COUNT(*) FROM store_transaction tr
+                     WHERE tr.seller_id = u.id AND tr.status = 'SU')
+                FROM users_user u
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
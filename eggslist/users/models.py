@@ -2,6 +2,7 @@ import typing as t
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from imagekit.models import ProcessedImageField
@@ -9,7 +10,7 @@ from imagekit.processors import ResizeToFill
 from phonenumber_field.modelfields import PhoneNumberField
 
 from eggslist.users import constants, managers
-from eggslist.users.user_location_storage import UserLocationStorage
+from eggslist.users.user_location_storage import UserLocation, UserLocationStorage
 
 if t.TYPE_CHECKING:
     from eggslist.site_configuration.models import LocationCity
@@ -47,13 +48,21 @@ class User(AbstractUser):
     REQUIRED_FIELDS = []
 
     @property
-    def user_location(self) -> "LocationCity":
+    def user_location(self) -> t.Optional["UserLocation"]:
         return UserLocationStorage.get_user_location(self.id)
 
     @user_location.setter
     def user_location(self, value: "LocationCity"):
         UserLocationStorage.set_user_location(self.id, city_location=value)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Products keep a copy of the seller location. Remember the loaded zip code
+        # to sync them only when it changes
+        instance._loaded_zip_code_id = instance.__dict__.get("zip_code_id")
+        return instance
+
     def set_password(self, *args, **kwargs):
         super().set_password(*args, **kwargs)
         self._set_password = True
@@ -61,6 +70,14 @@ class User(AbstractUser):
     class Meta:
         verbose_name = _("user")
         verbose_name_plural = _("users")
+        indexes = (
+            GinIndex(
+                fields=("first_name",), name="user_first_name_trgm", opclasses=("gin_trgm_ops",)
+            ),
+            GinIndex(
+                fields=("last_name",), name="user_last_name_trgm", opclasses=("gin_trgm_ops",)
+            ),
+        )
 
 
 class VerifiedSellerApplication(models.Model):
@@ -154,3 +171,33 @@ class UserStripeConnection(models.Model):
 
     def __str__(self):
         return self.stripe_account
+
+
+class UserStats(models.Model):
+    """
+    Denormalized counters of a user kept up to date by signals.
+    `reconcile_user_stats` command recomputes them from the source tables.
+    """
+
+    user = models.OneToOneField(
+        verbose_name=_("user"),
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="stats",
+        primary_key=True,
+    )
+    active_products_count = models.IntegerField(verbose_name=_("active products count"), default=0)
+    hidden_products_count = models.IntegerField(verbose_name=_("hidden products count"), default=0)
+    followers_count = models.IntegerField(verbose_name=_("followers count"), default=0)
+    blog_articles_count = models.IntegerField(verbose_name=_("blog articles count"), default=0)
+    successful_sales_count = models.IntegerField(
+        verbose_name=_("successful sales count"), default=0
+    )
+    objects = managers.UserStatsManager()
+
+    class Meta:
+        verbose_name = _("user stats")
+        verbose_name_plural = _("user stats")
+
+    def __str__(self):
+        return str(self.user_id)
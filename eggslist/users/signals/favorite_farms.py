@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eggslist.users import models
+from eggslist.users.constants import FAVORITE_FARMS_CACHE_GENERATION
+from eggslist.users.followed_sellers_storage import FollowedSellersStorage
+from eggslist.utils.cache_generation import CacheGeneration
+
+
+@receiver(post_save, sender=models.UserFavoriteFarm)
+@receiver(post_delete, sender=models.UserFavoriteFarm)
+def invalidate_favorite_farms(sender, instance: models.UserFavoriteFarm, **kwargs):
+    # Covers `UserFavoriteFarmManager.create_or_delete` and admin changes
+    FollowedSellersStorage.invalidate(user_id=instance.user_id)
+    CacheGeneration.bump(FAVORITE_FARMS_CACHE_GENERATION.format(user_id=instance.user_id))
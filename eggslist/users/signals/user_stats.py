@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eggslist.blogs.models import BlogArticle
+from eggslist.users import models
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def create_user_stats(sender, instance: User, created: bool, **kwargs):
+    if created:
+        models.UserStats.objects.get_or_create(user_id=instance.id)
+
+
+@receiver(post_save, sender=models.UserFavoriteFarm)
+def increase_followers_count(sender, instance: models.UserFavoriteFarm, created: bool, **kwargs):
+    if created:
+        models.UserStats.objects.increment(instance.following_user_id, followers_count=1)
+
+
+@receiver(post_delete, sender=models.UserFavoriteFarm)
+def decrease_followers_count(sender, instance: models.UserFavoriteFarm, **kwargs):
+    models.UserStats.objects.increment(instance.following_user_id, followers_count=-1)
+
+
+@receiver(post_save, sender=BlogArticle)
+def increase_blog_articles_count(sender, instance: BlogArticle, created: bool, **kwargs):
+    if created:
+        models.UserStats.objects.increment(instance.author_id, blog_articles_count=1)
+
+
+@receiver(post_delete, sender=BlogArticle)
+def decrease_blog_articles_count(sender, instance: BlogArticle, **kwargs):
+    models.UserStats.objects.increment(instance.author_id, blog_articles_count=-1)
@@ -1,11 +1,43 @@
 import typing as t
 
+from django.contrib.gis.geos.point import Point
 from django.core.cache import cache
 
 from eggslist.users.api.constants import USER_LOCATION_COOKIE_AGE
 
 if t.TYPE_CHECKING:
-    from eggslist.site_configuration.models import LocationCity
+    from eggslist.site_configuration.location_index import CityRecord
+
+
+class UserLocation(t.NamedTuple):
+    """
+    Resolved location of a visitor. It is attached to a request by LocationMiddleware
+    and stored in the cache as a plain tuple instead of a pickled city.
+    """
+
+    city_id: int
+    longitude: t.Optional[float]
+    latitude: t.Optional[float]
+    lookup_radius: int
+    is_undefined: bool
+
+    @classmethod
+    def from_city(
+        cls, city: "CityRecord", lookup_radius: int, is_undefined: bool
+    ) -> "UserLocation":
+        return cls(
+            city_id=city.id,
+            longitude=city.longitude,
+            latitude=city.latitude,
+            lookup_radius=int(lookup_radius),
+            is_undefined=is_undefined,
+        )
+
+    @property
+    def point(self) -> t.Optional[Point]:
+        if self.longitude is None or self.latitude is None:
+            return None
+        return Point(self.longitude, self.latitude, srid=4326)
 
 
 class UserLocationStorage:
@@ -13,26 +45,32 @@ class UserLocationStorage:
 
     @classmethod
     def set_user_location(
-        cls, user_id: str, city_location: "LocationCity", lookup_radius: int, is_undefined: bool
-    ):
+        cls, user_id: str, city_location: "CityRecord", lookup_radius: int, is_undefined: bool
+    ) -> UserLocation:
+        user_location = UserLocation.from_city(
+            city_location, lookup_radius=lookup_radius, is_undefined=is_undefined
+        )
         cache.set(
             key=cls._USER_LOCATION_CACHE_KEY.format(user_id=user_id),
-            value={
-                "city": city_location,
-                "lookup_radius": lookup_radius,
-                "is_undefined": is_undefined,
-            },
+            value=tuple(user_location),
             timeout=USER_LOCATION_COOKIE_AGE,
         )
+        return user_location
 
     @classmethod
-    def get_user_location(cls, user_id: str) -> t.Optional[t.Union["LocationCity", int]]:
+    def get_user_location(cls, user_id: str) -> t.Optional[UserLocation]:
         cached_value = cache.get(key=cls._USER_LOCATION_CACHE_KEY.format(user_id=user_id))
         if cached_value is None:
-            return None, None, None
+            return None
 
-        return (
-            cached_value.get("city"),
-            cached_value.get("lookup_radius"),
-            cached_value.get("is_undefined"),
-        )
+        if isinstance(cached_value, dict):
+            # Values stored before the compact format keep a pickled LocationCity
+            city = cached_value["city"]
+            return UserLocation(
+                city_id=city.id,
+                longitude=city.location.x if city.location is not None else None,
+                latitude=city.location.y if city.location is not None else None,
+                lookup_radius=int(cached_value["lookup_radius"]),
+                is_undefined=cached_value["is_undefined"],
+            )
+        return UserLocation(*cached_value)
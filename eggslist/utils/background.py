@@ -0,0 +1,37 @@
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+MAX_WORKERS = 4
+
+_executor: t.Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    # Created lazily, so the threads belong to a forked worker and not to the master
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS, thread_name_prefix="background"
+            )
+        return _executor
+
+
+def _run(func: t.Callable, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    finally:
+        # A thread owns its connection, it should not stay open between tasks
+        connection.close()
+
+
+def run_in_background(func: t.Callable, *args, **kwargs):
+    """
+    Run `func` in a thread pool of the current process. It is meant for short
+    network calls a response should not wait for, exceptions should be handled by `func`
+    """
+    _get_executor().submit(_run, func, *args, **kwargs)
@@ -0,0 +1,27 @@
+import statistics
+import time
+import typing as t
+
+
+class BenchmarkRollback(Exception):
+    """
+    Raise inside of `transaction.atomic()` to drop the synthetic benchmark data
+    """
+
+
+def measure(func: t.Callable, iterations: int = 100) -> t.Dict[str, float]:
+    """
+    Call `func` `iterations` times and return p50/p95 of its latency in milliseconds
+    """
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {"p50": percentiles[49], "p95": percentiles[94]}
+
+
+def format_result(name: str, result: t.Dict[str, float]) -> str:
+    return f"{name:<40} p50: {result['p50']:8.2f} ms   p95: {result['p95']:8.2f} ms"
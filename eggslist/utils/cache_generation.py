@@ -0,0 +1,70 @@
+import time
+import typing as t
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+if t.TYPE_CHECKING:
+    from django.db.models import Model
+
+
+class CacheGeneration:
+    """
+    Generation counters of cached data. Cache keys which include a generation
+    become unreachable after the generation is bumped, so a group of keys can be
+    invalidated at once without knowing them.
+    """
+
+    _GENERATION_CACHE_KEY = "cache_generation::{name}"
+
+    @classmethod
+    def _get_cache_key(cls, name: str) -> str:
+        return cls._GENERATION_CACHE_KEY.format(name=name)
+
+    @staticmethod
+    def _initial_value() -> int:
+        # Start from a timestamp, so a lost counter never repeats an old generation
+        return time.time_ns()
+
+    @classmethod
+    def get(cls, name: str) -> int:
+        return cls.get_many(name)[0]
+
+    @classmethod
+    def get_many(cls, *names: str) -> t.Tuple[int, ...]:
+        keys = [cls._get_cache_key(name) for name in names]
+        generations = cache.get_many(keys)
+        for key in keys:
+            if key not in generations:
+                cache.add(key, cls._initial_value(), timeout=None)
+                generations[key] = cache.get(key)
+        return tuple(generations[key] for key in keys)
+
+    @classmethod
+    def bump(cls, name: str):
+        key = cls._get_cache_key(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, cls._initial_value(), timeout=None)
+
+    @staticmethod
+    def get_model_generation_name(model: t.Type["Model"]) -> str:
+        return f"model::{model._meta.label_lower}"
+
+    @classmethod
+    def track_model(cls, model: t.Type["Model"]):
+        """
+        Bump the generation of `model` whenever its instances are saved or deleted
+        """
+
+        def bump_model_generation(sender, **kwargs):
+            cls.bump(cls.get_model_generation_name(model))
+
+        dispatch_uid = f"cache_generation::{model._meta.label_lower}"
+        post_save.connect(
+            bump_model_generation, sender=model, weak=False, dispatch_uid=dispatch_uid
+        )
+        post_delete.connect(
+            bump_model_generation, sender=model, weak=False, dispatch_uid=dispatch_uid
+        )
@@ -0,0 +1,177 @@
+import json
+import logging
+import time
+import typing as t
+import uuid
+from smtplib import SMTPException, SMTPRecipientsRefused
+
+from django.core import mail
+
+from eggslist.utils.redis import get_redis_client, make_key
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutbox:
+    """
+    Redis queue of rendered emails, so requests do not wait for the SMTP server.
+    `send_queued_emails` command sends them in batches over one SMTP connection.
+
+    A message is moved to a processing list while it is sent and removed from it
+    once the server accepts it, messages of a stopped worker are returned to the
+    queue by `requeue_processing`. Messages the server fails to accept are
+    retried with exponential backoff and moved to a dead list after `max_attempts`,
+    so a message is sent at least once.
+    """
+
+    _QUEUE_CACHE_KEY = "email_outbox::queue"
+    _PROCESSING_CACHE_KEY = "email_outbox::processing"
+    _RETRY_CACHE_KEY = "email_outbox::retry"
+    _DEAD_CACHE_KEY = "email_outbox::dead"
+    max_attempts = 6
+    # Seconds before the first retry, doubled by every next one
+    retry_delay = 30
+
+    @staticmethod
+    def _dump(message: mail.EmailMessage) -> str:
+        return json.dumps(
+            {
+                "id": uuid.uuid4().hex,
+                "subject": message.subject,
+                "body": message.body,
+                "content_subtype": message.content_subtype,
+                "from_email": message.from_email,
+                "to": message.to,
+                "attempts": 0,
+            }
+        )
+
+    @staticmethod
+    def _build(data: t.Dict) -> mail.EmailMessage:
+        message = mail.EmailMessage(
+            subject=data["subject"],
+            body=data["body"],
+            from_email=data["from_email"],
+            to=data["to"],
+        )
+        message.content_subtype = data["content_subtype"]
+        return message
+
+    @classmethod
+    def enqueue(cls, messages: t.Iterable[mail.EmailMessage]):
+        payloads = [cls._dump(message) for message in messages]
+        if payloads:
+            get_redis_client().lpush(make_key(cls._QUEUE_CACHE_KEY), *payloads)
+
+    @classmethod
+    def requeue_processing(cls) -> int:
+        """
+        Return messages a stopped worker was sending to the queue.
+        Must not be called while another worker is running
+        """
+        client = get_redis_client()
+        processing_key, queue_key = (
+            make_key(cls._PROCESSING_CACHE_KEY),
+            make_key(cls._QUEUE_CACHE_KEY),
+        )
+        requeued = 0
+        while client.rpoplpush(processing_key, queue_key) is not None:
+            requeued += 1
+        return requeued
+
+    @classmethod
+    def _promote_due_retries(cls, client):
+        retry_key = make_key(cls._RETRY_CACHE_KEY)
+        payloads = client.zrangebyscore(retry_key, 0, time.time())
+        if not payloads:
+            return
+        pipeline = client.pipeline()
+        pipeline.zrem(retry_key, *payloads)
+        pipeline.lpush(make_key(cls._QUEUE_CACHE_KEY), *payloads)
+        pipeline.execute()
+
+    @classmethod
+    def _finish(
+        cls,
+        client,
+        payload: bytes,
+        data: t.Dict,
+        error: t.Optional[Exception] = None,
+        can_retry: bool = True,
+    ):
+        """
+        Drop a sent message from the processing list or schedule its retry
+        """
+        pipeline = client.pipeline()
+        pipeline.lrem(make_key(cls._PROCESSING_CACHE_KEY), 1, payload)
+        if error is not None:
+            data["attempts"] = data.get("attempts", 0) + 1
+            if (
+                not can_retry
+                or isinstance(error, SMTPRecipientsRefused)
+                or data["attempts"] >= cls.max_attempts
+            ):
+                logger.error(
+                    "Email %s to %s is dropped: %r", data.get("id"), data.get("to"), error
+                )
+                pipeline.lpush(make_key(cls._DEAD_CACHE_KEY), json.dumps(data))
+            else:
+                retry_at = time.time() + cls.retry_delay * 2 ** (data["attempts"] - 1)
+                pipeline.zadd(make_key(cls._RETRY_CACHE_KEY), {json.dumps(data): retry_at})
+        pipeline.execute()
+
+    @staticmethod
+    def _load(payload: bytes) -> t.Dict:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return data
+        # Kept in the dead list as it is
+        return {
+            "id": None,
+            "to": None,
+            "attempts": 0,
+            "payload": payload.decode("utf-8", "replace"),
+        }
+
+    @classmethod
+    def send(cls, batch_size: int = 100) -> int:
+        """
+        Send up to `batch_size` queued messages over one SMTP connection.
+        Return the number of sent messages
+        """
+        client = get_redis_client()
+        cls._promote_due_retries(client)
+        queue_key = make_key(cls._QUEUE_CACHE_KEY)
+        if not client.llen(queue_key):
+            return 0
+
+        # Messages stay queued when the server is not reachable
+        connection = mail.get_connection()
+        connection.open()
+        sent = 0
+        try:
+            for _ in range(batch_size):
+                payload = client.rpoplpush(queue_key, make_key(cls._PROCESSING_CACHE_KEY))
+                if payload is None:
+                    break
+                data = cls._load(payload)
+                try:
+                    connection.send_messages([cls._build(data)])
+                except (SMTPException, OSError) as e:
+                    cls._finish(client, payload, data, error=e)
+                    # The connection may be broken, the next message opens a new one
+                    connection.close()
+                    connection.open()
+                except Exception as e:
+                    # A malformed message fails the same way on every attempt and
+                    # must not stay in the processing list to be requeued forever
+                    cls._finish(client, payload, data, error=e, can_retry=False)
+                else:
+                    cls._finish(client, payload, data)
+                    sent += 1
+        finally:
+            connection.close()
+        return sent
@@ -1,12 +1,19 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.db import transaction
 from django.template.loader import render_to_string
 
+from eggslist.utils.email_outbox import EmailOutbox
+
 User = get_user_model()
 
 
 def send_mailing(subject, mail_template, mail_object=None, users=None, email_addresses=None):
+    """
+    Render the emails and queue them to EmailOutbox once the current transaction
+    is committed. `send_queued_emails` command sends them
+    """
     emails = []
 
     email_addresses = email_addresses if email_addresses else [user.email for user in users]
@@ -23,6 +30,4 @@ def send_mailing(subject, mail_template, mail_object=None, users=None, email_add
         email.content_subtype = "html"
         emails.append(email)
 
-    connection = mail.get_connection()
-    connection.send_messages(emails)
-    connection.close()
+    transaction.on_commit(lambda: EmailOutbox.enqueue(emails))
@@ -0,0 +1,26 @@
+import functools
+
+from django.conf import settings
+from django.core.cache import cache
+from redis import Redis
+
+
+@functools.lru_cache(maxsize=None)
+def get_redis_client() -> Redis:
+    """
+    Client of the Redis server behind the default cache for data structures the
+    cache API lacks (hashes, sorted sets). Keys should be built with `make_key`.
+    `REDIS_URL` setting overrides the server, by default it is the first
+    (primary) location of the default cache.
+    """
+    url = getattr(settings, "REDIS_URL", None)
+    if url is None:
+        location = settings.CACHES["default"]["LOCATION"]
+        if isinstance(location, str):
+            location = location.split(",")
+        url = location[0]
+    return Redis.from_url(url)
+
+
+def make_key(key: str) -> str:
+    return cache.make_key(key)
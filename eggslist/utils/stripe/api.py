@@ -1,11 +1,14 @@
+import time
 import typing as t
 
 import stripe
 from django.conf import settings
 from django.db.utils import IntegrityError
 
+from eggslist.store.constants import CHECKOUT_SESSION_LIFETIME
 from eggslist.store.models import ProductArticle
 from eggslist.users.models import User, UserStripeConnection
+from eggslist.utils.stripe.products import StripeProductSync, get_unit_amount
 
 
 def create_account(user: "User") -> t.Tuple["stripe.Account", "UserStripeConnection"]:
@@ -60,22 +63,29 @@ def create_purchase_url(
     product: ProductArticle,
     transaction_id: int,
 ) -> str:
-    checkout_details = {
-        "line_items": [
-            {
-                "quantity": 1,
-                "price_data": {
-                    "currency": "USD",
-                    "product_data": {
-                        "name": product.title,
-                        "description": product.description,
-                        "images": [product.image.url],
-                    },
-                    "unit_amount": int(float(product.price) * 100),  # Cents
+    unit_amount = get_unit_amount(product.price)
+    if product.stripe_price_id is not None and product.stripe_price_amount == unit_amount:
+        line_item = {"quantity": 1, "price": product.stripe_price_id}
+    else:
+        # The price is not synced yet
+        line_item = {
+            "quantity": 1,
+            "price_data": {
+                "currency": "USD",
+                "product_data": {
+                    "name": product.title,
+                    "description": product.description,
+                    "images": [product.image.url],
                 },
-            }
-        ],
+                "unit_amount": unit_amount,
+            },
+        }
+        StripeProductSync.schedule(product.id)
+
+    checkout_details = {
+        "line_items": [line_item],
         "mode": "payment",
+        "expires_at": int(time.time()) + CHECKOUT_SESSION_LIFETIME,
         "success_url": "{site_url}/catalog/product?slug={slug}&popup_purchase=true".format(
             site_url=settings.SITE_URL, slug=product.slug
         ),
@@ -85,6 +95,8 @@ def create_purchase_url(
         "payment_intent_data": {
             "application_fee_amount": settings.STRIPE_APPLICATION_FEE,
             "receipt_email": None,
+            # Payment intent events are ordered with the events of their transaction
+            "metadata": {"transaction_id": str(transaction_id)},
         },
         "stripe_account": seller_connection.stripe_account,
         "client_reference_id": str(transaction_id),
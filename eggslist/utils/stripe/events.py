@@ -0,0 +1,192 @@
+import logging
+import traceback
+import typing as t
+from datetime import datetime, timedelta, timezone
+
+import stripe
+from django.conf import settings
+from django.db import transaction as db_transaction
+
+from eggslist.store.models import StripeWebhookEvent, Transaction
+from eggslist.users.models import UserStripeConnection
+from eggslist.utils.emailing import send_mailing
+from eggslist.utils.stripe.onboarding import OnboardingStatus
+
+logger = logging.getLogger(__name__)
+
+SESSION_TRANSACTION_EVENT_TO_STATUS = {
+    "checkout.session.completed": Transaction.Status.CHECKOUT_COMPLETED,
+    "checkout.session.async_payment_succeeded": Transaction.Status.SUCCESS,
+    "checkout.session.async_payment_failed": Transaction.Status.FAILED,
+    "checkout.session.expired": Transaction.Status.FAILED,
+}
+
+PAYMENT_INTENT_TRANSACTION_EVENT_TO_STATUS = {
+    "payment_intent.canceled": Transaction.Status.FAILED,
+    "payment_intent.succeeded": Transaction.Status.SUCCESS,
+    "payment_intent.payment_failed": Transaction.Status.FAILED,
+}
+
+MAX_ATTEMPTS = 8
+# Seconds before the first retry of a failed event, doubled by every next one
+RETRY_DELAY = 15
+
+
+def account_updated_event(event: stripe.Event, stripe_connection: UserStripeConnection):
+    if event.data.object.get("details_submitted", False):
+        OnboardingStatus.mark_completed(stripe_connection.stripe_account)
+
+
+def send_sale_emails(transaction: Transaction):
+    # Still unclear how to make stripe to send receipts to customers. Now it's only available
+    # if seller allows this in their Stripe account dahsboard
+    customer_email = (
+        transaction.customer.email
+        if transaction.customer is not None
+        else transaction.customer_email
+    )
+    customer_name = transaction.customer.first_name if transaction.customer is not None else None
+    seller_email = transaction.seller.email
+    seller_name = transaction.seller.first_name
+    send_mailing(
+        subject="Eggslist Notification: Sale!",
+        mail_template="emails/stripe_purchase_seller.html",
+        mail_object={
+            "website_profile_url": f"{settings.SITE_URL}/profile",
+            "product_title": transaction.product.title,
+            "product_url": f"{settings.SITE_URL}/catalog/product?slug={transaction.product.slug}",
+            "customer_email": customer_email,
+            "customer_name": customer_name,
+        },
+        users=[transaction.seller],
+    )
+
+    if customer_email is not None:
+        send_mailing(
+            subject="Eggslist Notification: Purchase!",
+            mail_template="emails/stripe_purchase_buyer.html",
+            email_addresses=[customer_email],
+            mail_object={
+                "product_title": transaction.product.title,
+                "product_url": f"{settings.SITE_URL}/catalog/product?slug={transaction.product.slug}",
+                "seller_email": seller_email,
+                "seller_name": seller_name,
+            },
+        )
+
+
+def session_transaction_events(event: stripe.Event):
+    transaction_id = event.data.object.get("client_reference_id")
+    try:
+        transaction = (
+            Transaction.objects.select_for_update(of=("self",))
+            .select_related("customer", "seller", "product")
+            .get(id=int(transaction_id))
+        )
+    except (Transaction.DoesNotExist, TypeError):
+        logger.error("There is no transaction with ID: %s", (transaction_id,))
+        return
+    payment_intent_id = event.data.object.get("payment_intent")
+    transaction.payment_intent = payment_intent_id
+    if not transaction.customer_email:
+        if event.data.object.get("customer_email"):
+            transaction.customer_email = event.data.object.get("customer_email")
+        else:
+            transaction.customer_email = event.data.object.get("customer_details", {}).get("email")
+    if event.data.object.get("payment_status") == "paid":
+        # Both `completed` and `async_payment_succeeded` sessions may be paid,
+        # the sale is announced once
+        if transaction.status != Transaction.Status.SUCCESS:
+            send_sale_emails(transaction)
+        transaction.status = Transaction.Status.SUCCESS
+
+    if transaction.status != Transaction.Status.SUCCESS:
+        transaction.status = SESSION_TRANSACTION_EVENT_TO_STATUS.get(event.get("type"))
+    transaction.save()
+
+
+def payment_intent_transaction_events(event: stripe.Event):
+    transaction_payment_intent = event.data.object.get("id")
+    try:
+        transaction = Transaction.objects.select_for_update().get(
+            payment_intent=transaction_payment_intent
+        )
+    except Transaction.DoesNotExist:
+        logger.error("There is no transaction with payment intent: %s", transaction_payment_intent)
+        return
+    if not transaction.customer_email and event.data.object.get("receipt_email"):
+        transaction.customer_email = event.data.object.get("receipt_email")
+    if transaction.status != Transaction.Status.SUCCESS:
+        transaction.status = PAYMENT_INTENT_TRANSACTION_EVENT_TO_STATUS.get(event.get("type"))
+    transaction.save()
+
+
+def handle_event(event: stripe.Event):
+    stripe_account = event.get("account")
+    try:
+        stripe_connection = UserStripeConnection.objects.select_for_update().get(
+            stripe_account=stripe_account
+        )
+    except UserStripeConnection.DoesNotExist:
+        logger.error("There is no stripe account with ID: %s", (stripe_account,))
+        return
+    logger.info("Processing Stripe webhook event with type: %s", event.get("type"))
+    if event.get("type") == "account.updated":
+        account_updated_event(event, stripe_connection)
+
+    if event.get("type") in SESSION_TRANSACTION_EVENT_TO_STATUS.keys():
+        session_transaction_events(event)
+
+    if event.get("type") in PAYMENT_INTENT_TRANSACTION_EVENT_TO_STATUS.keys():
+        payment_intent_transaction_events(event)
+
+
+def process_event(webhook_event: StripeWebhookEvent) -> bool:
+    """
+    Apply an event and mark it processed in one database transaction. Emails are
+    queued only when it commits, so side effects of an event happen at most once.
+    A failed event is retried later with a backoff. Return whether it succeeded
+    """
+    now = datetime.now(tz=timezone.utc)
+    try:
+        with db_transaction.atomic():
+            handle_event(stripe.Event.construct_from(webhook_event.payload, stripe.api_key))
+            webhook_event.status = StripeWebhookEvent.Status.PROCESSED
+            webhook_event.processed_at = now
+            webhook_event.save(update_fields=("status", "processed_at"))
+        return True
+    except Exception:
+        logger.exception("Stripe webhook event %s failed", webhook_event.event_id)
+        webhook_event.attempts += 1
+        webhook_event.last_error = traceback.format_exc()
+        webhook_event.status = StripeWebhookEvent.Status.PENDING
+        if webhook_event.attempts >= MAX_ATTEMPTS:
+            webhook_event.status = StripeWebhookEvent.Status.FAILED
+        else:
+            delay = RETRY_DELAY * 2 ** (webhook_event.attempts - 1)
+            webhook_event.next_attempt_at = now + timedelta(seconds=delay)
+        webhook_event.save(update_fields=("attempts", "last_error", "status", "next_attempt_at"))
+        return False
+
+
+def process_pending_events(
+    batch_size: int = 100, event_ids: t.Optional[t.Collection[str]] = None
+) -> t.Tuple[int, int]:
+    """
+    Process a batch of pending events, the oldest first, only of `event_ids` when
+    given. Events following a failed one of the same transaction or account wait
+    for it. Return the numbers of processed and failed events
+    """
+    processed = failed = 0
+    blocked_keys = set()
+    for webhook_event in StripeWebhookEvent.objects.get_pending(
+        limit=batch_size, event_ids=event_ids
+    ):
+        if webhook_event.ordering_key in blocked_keys:
+            continue
+        if process_event(webhook_event):
+            processed += 1
+        else:
+            failed += 1
+            blocked_keys.add(webhook_event.ordering_key)
+    return processed, failed
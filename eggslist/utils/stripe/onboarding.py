@@ -0,0 +1,95 @@
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from eggslist.users.models import UserStripeConnection
+from eggslist.utils.background import run_in_background
+from eggslist.utils.emailing import send_mailing
+from eggslist.utils.stripe import api as stripe_api
+
+logger = logging.getLogger(__name__)
+
+
+class OnboardingStatus:
+    """
+    Stripe onboarding state of connected accounts. Onboarding is completed by
+    `account.updated` webhook. Until it arrives requests read the last answer of
+    Stripe cached for `timeout` seconds. Without a cached answer one request
+    over all workers schedules a refresh in a background thread, and every
+    request returns the stored state without waiting for Stripe.
+    """
+
+    _STATUS_CACHE_KEY = "stripe_onboarding::{stripe_account}"
+    _LOCK_CACHE_KEY = "stripe_onboarding::{stripe_account}::lock"
+    timeout = 60
+    lock_timeout = 30
+
+    @classmethod
+    def is_completed(cls, stripe_connection: UserStripeConnection) -> bool:
+        if stripe_connection.is_onboarding_completed:
+            return True
+
+        stripe_account = stripe_connection.stripe_account
+        is_completed = cache.get(cls._STATUS_CACHE_KEY.format(stripe_account=stripe_account))
+        if is_completed is None:
+            cls.refresh_in_background(stripe_account)
+            return False
+        return is_completed
+
+    @classmethod
+    def refresh_in_background(cls, stripe_account: str):
+        lock_key = cls._LOCK_CACHE_KEY.format(stripe_account=stripe_account)
+        # Single flight: concurrent requests do not ask Stripe about the same account
+        if cache.add(lock_key, 1, timeout=cls.lock_timeout):
+            run_in_background(cls._refresh, stripe_account, lock_key)
+
+    @classmethod
+    def _refresh(cls, stripe_account: str, lock_key: str):
+        try:
+            is_completed = stripe_api.is_onboarding_completed(
+                UserStripeConnection(stripe_account=stripe_account)
+            )
+            if is_completed:
+                cls.mark_completed(stripe_account)
+            else:
+                cache.set(
+                    cls._STATUS_CACHE_KEY.format(stripe_account=stripe_account),
+                    False,
+                    timeout=cls.timeout,
+                )
+        except Exception:
+            logger.exception("Could not refresh Stripe onboarding of %s", stripe_account)
+        finally:
+            cache.delete(lock_key)
+
+    @classmethod
+    def mark_completed(cls, stripe_account: str) -> bool:
+        """
+        Store completed onboarding and notify the seller once.
+        Return False when it was stored before
+        """
+        updated = UserStripeConnection.objects.filter(
+            stripe_account=stripe_account, is_onboarding_completed=False
+        ).update(is_onboarding_completed=True, modified_at=timezone.now())
+        # A rolled back webhook event must not leave the account cached as connected
+        transaction.on_commit(
+            lambda: cache.set(
+                cls._STATUS_CACHE_KEY.format(stripe_account=stripe_account),
+                True,
+                timeout=cls.timeout,
+            )
+        )
+        if not updated:
+            return False
+
+        stripe_connection = UserStripeConnection.objects.select_related("user").get(
+            stripe_account=stripe_account
+        )
+        send_mailing(
+            subject="Stripe",
+            mail_template="emails/stripe_connected.html",
+            users=[stripe_connection.user],
+        )
+        return True
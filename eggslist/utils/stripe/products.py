@@ -0,0 +1,103 @@
+import logging
+from decimal import Decimal
+
+import stripe
+from django.core.cache import cache
+
+from eggslist.store.models import ProductArticle
+from eggslist.utils.background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+
+def get_unit_amount(price: Decimal) -> int:
+    # Cents
+    return int(price * 100)
+
+
+class StripeProductSync:
+    """
+    Stripe Product and Price of a product article on its seller's connected
+    account, so a checkout session refers to the price instead of sending the
+    product data. Prices are immutable: a new one replaces the price of the
+    article when its price changes.
+
+    Syncs run in a background thread, one at a time per article. A sync
+    requested meanwhile runs right after the current one.
+    """
+
+    _LOCK_CACHE_KEY = "stripe_product_sync::{article_id}::lock"
+    _PENDING_CACHE_KEY = "stripe_product_sync::{article_id}::pending"
+    lock_timeout = 60
+
+    @classmethod
+    def schedule(cls, article_id: int):
+        cache.set(
+            cls._PENDING_CACHE_KEY.format(article_id=article_id), 1, timeout=cls.lock_timeout
+        )
+        lock_key = cls._LOCK_CACHE_KEY.format(article_id=article_id)
+        if cache.add(lock_key, 1, timeout=cls.lock_timeout):
+            run_in_background(cls._run, article_id, lock_key)
+
+    @classmethod
+    def _run(cls, article_id: int, lock_key: str):
+        pending_key = cls._PENDING_CACHE_KEY.format(article_id=article_id)
+        try:
+            while cache.delete(pending_key):
+                cls.sync(article_id)
+        except Exception:
+            logger.exception("Could not sync Stripe product of article %s", article_id)
+        finally:
+            cache.delete(lock_key)
+
+    @staticmethod
+    def sync(article_id: int):
+        try:
+            article = ProductArticle.objects.select_related("seller__stripe_connection").get(
+                id=article_id
+            )
+        except ProductArticle.DoesNotExist:
+            return
+        stripe_connection = getattr(article.seller, "stripe_connection", None)
+        if stripe_connection is None or not stripe_connection.is_onboarding_completed:
+            # Products are created on the seller's account
+            return
+
+        stripe_account = stripe_connection.stripe_account
+        product_data = {
+            "name": article.title,
+            # Empty values are not sent
+            "description": article.description or None,
+            "images": [article.image.url] if article.image else None,
+            "active": not article.is_archived,
+        }
+        updates = {}
+        if article.stripe_product_id is None:
+            product = stripe.Product.create(
+                **product_data,
+                metadata={"product_article.id": article.id},
+                stripe_account=stripe_account,
+            )
+            updates["stripe_product_id"] = article.stripe_product_id = product.id
+        else:
+            stripe.Product.modify(
+                article.stripe_product_id, **product_data, stripe_account=stripe_account
+            )
+
+        unit_amount = get_unit_amount(article.price)
+        if "stripe_product_id" in updates or article.stripe_price_amount != unit_amount:
+            price = stripe.Price.create(
+                product=article.stripe_product_id,
+                currency="usd",
+                unit_amount=unit_amount,
+                stripe_account=stripe_account,
+            )
+            if article.stripe_price_id is not None and "stripe_product_id" not in updates:
+                stripe.Price.modify(
+                    article.stripe_price_id, active=False, stripe_account=stripe_account
+                )
+            updates.update(stripe_price_id=price.id, stripe_price_amount=unit_amount)
+
+        if updates:
+            # Not `save()`, it would schedule one more sync
+            ProductArticle.objects.filter(id=article.id).update(**updates)
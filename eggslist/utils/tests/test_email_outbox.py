@@ -0,0 +1,131 @@
+import time
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import SimpleTestCase, override_settings
+
+from eggslist.utils.email_outbox import EmailOutbox
+from eggslist.utils.redis import get_redis_client, make_key
+
+
+class FlakyEmailBackend(EmailBackend):
+    """
+    Local stand-in of the SMTP server: refuses `refused@` recipients and drops
+    the connection for the next `failures[address]` messages to an address
+    """
+
+    failures = {}
+
+    def send_messages(self, messages):
+        for message in messages:
+            for address in message.to:
+                if address.startswith("refused@"):
+                    raise SMTPRecipientsRefused({address: (550, b"No such user")})
+                if self.failures.get(address):
+                    self.failures[address] -= 1
+                    raise SMTPServerDisconnected("Connection unexpectedly closed")
+        return super().send_messages(messages)
+
+
+@override_settings(
+    CACHES={"default": {**settings.CACHES["default"], "KEY_PREFIX": "test_email_outbox"}},
+    EMAIL_BACKEND="eggslist.utils.tests.test_email_outbox.FlakyEmailBackend",
+)
+class EmailOutboxTestCase(SimpleTestCase):
+    def setUp(self):
+        self.client = get_redis_client()
+        self.keys = [
+            make_key(key)
+            for key in (
+                EmailOutbox._QUEUE_CACHE_KEY,
+                EmailOutbox._PROCESSING_CACHE_KEY,
+                EmailOutbox._RETRY_CACHE_KEY,
+                EmailOutbox._DEAD_CACHE_KEY,
+            )
+        ]
+        self.client.delete(*self.keys)
+        self.addCleanup(self.client.delete, *self.keys)
+        FlakyEmailBackend.failures = {}
+        mail.outbox = []
+
+    def enqueue(self, *addresses: str):
+        EmailOutbox.enqueue(
+            mail.EmailMessage(subject="Eggslist", body="<p>Hi</p>", to=[address])
+            for address in addresses
+        )
+
+    def get_list(self, key: str):
+        return self.client.lrange(make_key(key), 0, -1)
+
+    def test_send(self):
+        self.enqueue("first@example.com", "second@example.com")
+
+        self.assertEqual(EmailOutbox.send(), 2)
+
+        self.assertEqual(
+            [message.to for message in mail.outbox],
+            [["first@example.com"], ["second@example.com"]],
+        )
+        self.assertEqual(self.get_list(EmailOutbox._QUEUE_CACHE_KEY), [])
+        self.assertEqual(self.get_list(EmailOutbox._PROCESSING_CACHE_KEY), [])
+
+    def test_retry_with_backoff(self):
+        FlakyEmailBackend.failures = {"flaky@example.com": 2}
+        self.enqueue("flaky@example.com")
+        now = time.time()
+
+        self.assertEqual(EmailOutbox.send(), 0)
+        ((_, retry_at),) = self.client.zrange(
+            make_key(EmailOutbox._RETRY_CACHE_KEY), 0, -1, withscores=True
+        )
+        self.assertAlmostEqual(retry_at, now + EmailOutbox.retry_delay, delta=5)
+        # Not due yet
+        self.assertEqual(EmailOutbox.send(), 0)
+
+        with mock.patch("time.time", return_value=retry_at + 1):
+            self.assertEqual(EmailOutbox.send(), 0)
+        ((_, retry_at),) = self.client.zrange(
+            make_key(EmailOutbox._RETRY_CACHE_KEY), 0, -1, withscores=True
+        )
+        # The delay is doubled by the second failure
+        self.assertAlmostEqual(retry_at, now + 3 * EmailOutbox.retry_delay, delta=5)
+
+        with mock.patch("time.time", return_value=retry_at + 1):
+            self.assertEqual(EmailOutbox.send(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(self.client.zcard(make_key(EmailOutbox._RETRY_CACHE_KEY)), 0)
+
+    def test_refused_recipients_are_dead_lettered(self):
+        self.enqueue("refused@example.com", "valid@example.com")
+
+        self.assertEqual(EmailOutbox.send(), 1)
+
+        self.assertEqual([message.to for message in mail.outbox], [["valid@example.com"]])
+        self.assertEqual(len(self.get_list(EmailOutbox._DEAD_CACHE_KEY)), 1)
+        self.assertEqual(self.client.zcard(make_key(EmailOutbox._RETRY_CACHE_KEY)), 0)
+        self.assertEqual(self.get_list(EmailOutbox._PROCESSING_CACHE_KEY), [])
+
+    def test_malformed_messages_are_dead_lettered(self):
+        self.client.lpush(make_key(EmailOutbox._QUEUE_CACHE_KEY), "not json", '{"id": "1"}')
+        self.enqueue("valid@example.com")
+
+        self.assertEqual(EmailOutbox.send(), 1)
+
+        self.assertEqual(len(self.get_list(EmailOutbox._DEAD_CACHE_KEY)), 2)
+        self.assertEqual(self.get_list(EmailOutbox._PROCESSING_CACHE_KEY), [])
+        self.assertEqual(EmailOutbox.requeue_processing(), 0)
+
+    def test_requeue_processing(self):
+        self.enqueue("first@example.com")
+        # A worker stopped while sending the message
+        self.client.rpoplpush(
+            make_key(EmailOutbox._QUEUE_CACHE_KEY), make_key(EmailOutbox._PROCESSING_CACHE_KEY)
+        )
+        self.assertEqual(EmailOutbox.send(), 0)
+
+        self.assertEqual(EmailOutbox.requeue_processing(), 1)
+        self.assertEqual(EmailOutbox.send(), 1)
+        self.assertEqual(len(mail.outbox), 1)
@@ -1,28 +1,114 @@
+import typing as t
+
 from django.conf import settings
 from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from eggslist.utils import constants
+from eggslist.utils.cache_generation import CacheGeneration
+from eggslist.utils.views.response_cache import ResponseCache
+
+if t.TYPE_CHECKING:
+    from django.db.models import Model
 
 
 class CacheListAPIMixin:
+    """
+    Cache serialized rows of a list view. Filtered and searched variants are
+    stored under their own keys. A key includes generations of `cache_models`,
+    which are bumped whenever any of their instances is saved or deleted.
+    Paginated responses are not cached.
+    """
+
     cache_key = None
+    cache_models: t.Tuple[t.Type["Model"], ...] = ()
     timeout = constants.ONE_HOUR
 
-    def get_queryset(self, *args, **kwargs):
-        qs = cache.get(f"view_cache:{self.cache_key}")
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for model in cls.cache_models:
+            CacheGeneration.track_model(model)
+
+    def get_list_cache_key(self, request) -> str:
+        generations = CacheGeneration.get_many(
+            *(CacheGeneration.get_model_generation_name(model) for model in self.cache_models)
+        )
+        return "view_cache::{cache_key}::{generations}::{query_signature}".format(
+            cache_key=self.cache_key,
+            generations=":".join(str(generation) for generation in generations),
+            query_signature=ResponseCache.get_query_signature(request),
+        )
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+
+        key = self.get_list_cache_key(request)
+        rows = cache.get(key)
+        if rows is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            rows = [dict(row) for row in self.get_serializer(queryset, many=True).data]
+            cache.set(key, rows, timeout=self.timeout)
+        return Response(rows)
+
 
-        if not qs:
-            qs = super().get_queryset(*args, **kwargs)
-            cache.set(f"view_cache:{self.cache_key}", qs, timeout=self.timeout)
+class CacheResponseAPIMixin:
+    """
+    Serve GET responses from ResponseCache. Only JSON 200 responses are stored,
+    hits are returned as they were rendered without running the view.
+    `response_cache_generations` name the cache generations the response depends on.
+    Responses with user specific data are stored per user with `response_cache_per_user`.
+    """
 
-        return qs
+    response_cache_generations: t.Tuple[str, ...] = ()
+    response_cache_per_user = False
+    response_cache_timeout = 60 * 5
+
+    def get_response_cache_generations(self, request) -> t.Sequence[str]:
+        return self.response_cache_generations
+
+    def is_response_cacheable(self, request) -> bool:
+        return request.accepted_renderer.format == "json"
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_response_cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        key = ResponseCache.get_cache_key(
+            view_name=type(self).__name__,
+            request=request,
+            generation_names=self.get_response_cache_generations(request),
+            per_user=self.response_cache_per_user,
+        )
+        content = ResponseCache.get(key)
+        if content is not None:
+            return HttpResponse(content, content_type=request.accepted_renderer.media_type)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: ResponseCache.set(
+                    key, rendered.content, timeout=self.response_cache_timeout
+                )
+            )
+        return response
 
 
 class AnonymousUserIdAPIMixin:
+    # Opt in for LocationMiddleware
+    location_aware = True
+
     def get_user_id(self):
         return self.request.COOKIES.get(settings.USER_LOCATION_COOKIE_NAME)
 
+    def get_user_location(self):
+        """
+        Location resolved by LocationMiddleware for the current request
+        """
+        return getattr(self.request, "location", None)
+
 
 class JWTMixin:
     def get_token_data(self, user):
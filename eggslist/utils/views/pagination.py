@@ -1,11 +1,83 @@
+import base64
+import binascii
+import hashlib
+import json
+import typing as t
 from collections import OrderedDict
+from datetime import datetime
 
+from django.contrib.gis.measure import Distance
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder cuts datetimes to milliseconds, which would make a cursor
+    repeat or skip rows created within the same millisecond as its row.
+    Datetimes are kept to microseconds and tagged, so they are parsed back
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return {"datetime": o.isoformat()}
+        return super().default(o)
+
+
+def decode_cursor_value(obj: t.Dict):
+    if obj.keys() == {"datetime"}:
+        return datetime.fromisoformat(obj["datetime"])
+    return obj
+
+
+class QueryCounter:
+    """
+    Count rows of a queryset cheaply:
+    * annotations and ordering which do not change the number of rows are not computed;
+    * counts are cached per query signature (its SQL with parameters) for `timeout`;
+    * with `limit` at most `limit` + 1 rows are counted in a `COUNT(*)` over
+      a `LIMIT` subquery, so a count above `limit` is a lower bound.
+    """
+
+    _COUNT_CACHE_KEY = "query_count::{signature}::{limit}"
+    timeout = 60
+
+    @classmethod
+    def count(cls, queryset: QuerySet, limit: t.Optional[int] = None) -> int:
+        if queryset.query.is_sliced:
+            return queryset.count()
+
+        # Unselected annotations are left out of the counting subquery
+        queryset = queryset.order_by().values("pk")
+        sql, params = queryset.query.sql_with_params()
+        signature = hashlib.sha1(f"{sql}::{params!r}".encode()).hexdigest()
+        key = cls._COUNT_CACHE_KEY.format(signature=signature, limit=limit)
+
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count() if limit is None else queryset[: limit + 1].count()
+            cache.set(key, count, timeout=cls.timeout)
+        return count
+
+
+class QueryCounterPaginator(Paginator):
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            return QueryCounter.count(self.object_list)
+        return super().count
 
 
 class PageNumberPaginationWithCount(pagination.PageNumberPagination):
     page_size = 12
+    django_paginator_class = QueryCounterPaginator
 
     def get_paginated_response(self, data):
         return Response(self.get_paginated_dict(data))
@@ -20,3 +92,143 @@ class PageNumberPaginationWithCount(pagination.PageNumberPagination):
                 ("results", data),
             ]
         )
+
+
+class PageNumberOrCursorPagination(PageNumberPaginationWithCount):
+    """
+    Page number pagination which switches to keyset (cursor) pagination once `cursor`
+    query parameter is present, e.g. `?cursor=` for the first page. Cursor pages
+    continue right after the last row of the previous page by the current ordering
+    plus `id`, so deep pages cost the same as the first one and no count is
+    issued unless `with_count=true` is asked. Such a count stops at
+    `cursor_count_limit` rows and `count_is_lower_bound` tells when it did.
+
+    Ordering fields must not be nullable and rows of `.values()` querysets have to
+    include them. Only forward links are provided, so `previous` is always empty
+    in the cursor mode.
+    """
+
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+    invalid_cursor_message = "Invalid cursor"
+    cursor_count_limit = 10_000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = (
+            self.cursor_query_param in request.query_params and not queryset.query.is_sliced
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*self.ordering)
+        self.count = (
+            QueryCounter.count(queryset, limit=self.cursor_count_limit)
+            if request.query_params.get(self.count_query_param) == "true"
+            else None
+        )
+
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        page_size = self.get_page_size(request)
+        rows = list(queryset[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.rows = rows[:page_size]
+        return self.rows
+
+    @staticmethod
+    def get_ordering(queryset) -> t.List[str]:
+        query = queryset.query
+        ordering = list(
+            query.order_by or (query.get_meta().ordering if query.default_ordering else ())
+        )
+        if any(not isinstance(field, str) for field in ordering):
+            raise NotFound("Cursor pagination supports ordering by field names only")
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering.append("id")
+        return ordering
+
+    def get_position_filter(self, position: t.List) -> Q:
+        """
+        Rows placed after `position` by the ordering: (a, b) > (x, y) turns to
+        `a > x OR (a = x AND b > y)` with the comparison flipped for descending fields
+        """
+        position_filter = Q()
+        for i, field in enumerate(self.ordering):
+            equal = {name.lstrip("-"): value for name, value in zip(self.ordering[:i], position)}
+            lookup = "__lt" if field.startswith("-") else "__gt"
+            position_filter |= Q(**equal, **{field.lstrip("-") + lookup: position[i]})
+        return position_filter
+
+    @classmethod
+    def get_field_value(cls, obj, field: str):
+        if isinstance(obj, dict):
+            value = obj[field]
+        # Annotations like `seller__is_favorite` are set on the object as they are named
+        elif hasattr(obj, field):
+            value = getattr(obj, field)
+        else:
+            value = obj
+            for attribute in field.split("__"):
+                value = getattr(value, attribute)
+        # Distances are compared in meters of geography columns
+        if isinstance(value, Distance):
+            return value.m
+        return value
+
+    def encode_cursor(self, obj) -> str:
+        position = [self.get_field_value(obj, field.lstrip("-")) for field in self.ordering]
+        cursor = json.dumps({"o": self.ordering, "p": position}, cls=CursorJSONEncoder)
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    def decode_cursor(self, encoded: str) -> t.Optional[t.List]:
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(
+                base64.urlsafe_b64decode(encoded.encode()), object_hook=decode_cursor_value
+            )
+            ordering, position = cursor["o"], cursor["p"]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor is bound to the ordering it was created for
+        if ordering != self.ordering or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.rows[-1]))
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        return None
+
+    def get_paginated_dict(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_dict(data)
+        return OrderedDict(
+            [
+                ("count", self.count),
+                (
+                    "count_is_lower_bound",
+                    self.count is not None and self.count > self.cursor_count_limit,
+                ),
+                ("next", self.get_next_link()),
+                ("previous", None),
+                ("results", data),
+            ]
+        )
+
+    def get_html_context(self):
+        if not self.cursor_mode:
+            return super().get_html_context()
+        return {"previous_url": None, "next_url": self.get_next_link(), "page_links": []}
@@ -0,0 +1,71 @@
+import hashlib
+import typing as t
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+from eggslist.utils.cache_generation import CacheGeneration
+
+if t.TYPE_CHECKING:
+    from rest_framework.request import Request
+
+
+class ResponseCache:
+    """
+    Rendered response bodies. A key is made of the view, the host and normalized
+    query parameters of the request, visitor's location bucket, authentication
+    state and the generations of the data the view depends on, so bumping any of
+    the generations drops all of the stored responses of the view. Pagination links
+    are absolute, so responses are not shared between hosts.
+    """
+
+    _RESPONSE_CACHE_KEY = (
+        "response_cache::{view}::{generations}::{auth}::{location}::{host}::{query_signature}"
+    )
+
+    @staticmethod
+    def get_query_signature(request: "Request") -> str:
+        query_params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+            if value != ""
+        )
+        return hashlib.sha1(urlencode(query_params).encode()).hexdigest()
+
+    @staticmethod
+    def get_location_bucket(request: "Request") -> str:
+        location = getattr(request, "location", None)
+        if location is None:
+            return "none"
+        return f"{location.city_id}:{location.lookup_radius}"
+
+    @classmethod
+    def get_cache_key(
+        cls,
+        view_name: str,
+        request: "Request",
+        generation_names: t.Sequence[str],
+        per_user: bool = False,
+    ) -> str:
+        generations = CacheGeneration.get_many(*generation_names) if generation_names else ()
+        if not request.user.is_authenticated:
+            auth = "anonymous"
+        else:
+            auth = f"user:{request.user.id}" if per_user else "authenticated"
+        return cls._RESPONSE_CACHE_KEY.format(
+            view=view_name,
+            generations=":".join(str(generation) for generation in generations),
+            auth=auth,
+            location=cls.get_location_bucket(request),
+            host=request.get_host(),
+            query_signature=cls.get_query_signature(request),
+        )
+
+    @staticmethod
+    def get(key: str) -> t.Optional[bytes]:
+        return cache.get(key)
+
+    @staticmethod
+    def set(key: str, content: bytes, timeout: int):
+        cache.set(key, content, timeout=timeout)
@@ -2,5 +2,9 @@
 service redis-server start
 python manage.py migrate
 python manage.py collectstatic --noinput
+python manage.py flush_store_buffers --loop &
+python manage.py send_queued_emails --loop &
+python manage.py process_stripe_events --loop &
+python manage.py reap_abandoned_transactions --loop &
 gunicorn wsgi:application --workers 2 --timeout 600 --bind 0.0.0.0:80
 